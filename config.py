@@ -2,20 +2,25 @@
 Configuración central del bot.
 """
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+from dotenv import dotenv_values
+
+# Parsear .env una sola vez y mezclar con el entorno real (el entorno gana).
+# Los accesos posteriores son lookups de dict, sin pasar por os.environ.
+_ENV = {**dotenv_values(), **os.environ}
 
 # Discord
-DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
+DISCORD_TOKEN = _ENV.get("DISCORD_TOKEN")
+# Sincronizar comandos slash al arrancar (poner SYNC_COMMANDS=0 en dev)
+SYNC_COMMANDS = _ENV.get("SYNC_COMMANDS", "1") != "0"
 
 # Google Docs
-GOOGLE_DOC_ID = os.getenv("GOOGLE_DOC_ID", "1wxsL6Qe5hbXHXqTWTHcFbwB6Rkdr6Ao2ez2mXyyjtrY")
-GOOGLE_CREDENTIALS_PATH = os.getenv("GOOGLE_CREDENTIALS_PATH", "service_account.json")
+GOOGLE_DOC_ID = _ENV.get("GOOGLE_DOC_ID", "1wxsL6Qe5hbXHXqTWTHcFbwB6Rkdr6Ao2ez2mXyyjtrY")
+GOOGLE_CREDENTIALS_PATH = _ENV.get("GOOGLE_CREDENTIALS_PATH", "service_account.json")
 
 # Delimitadores para ignorar contenido (última página)
 # Añade aquí cualquier texto que marque el inicio de contenido a ignorar
-PAGE_DELIMITERS = [
+PAGE_DELIMITERS = (
     "-----",
     "───",
     "---",
@@ -24,7 +29,7 @@ PAGE_DELIMITERS = [
     "2024/25",  # Si hay un encabezado de año, ignorar desde ahí
     "2024",
     "2025",
-]
+)
 
 # Separador entre título y proponente
 MOVIE_SEPARATOR = " - "
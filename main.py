@@ -12,35 +12,54 @@ Características:
 Uso:
     python main.py
 """
+import asyncio
 import sys
 
 from src.utils import setup_logging, get_logger
 
 
+def _import_and_construct():
+    """Importa el bot (y con él discord.py) y construye la instancia.
+
+    Se ejecuta en un executor para no bloquear el event loop con el
+    import pesado de discord.
+    """
+    from src.bot import PelisBot
+    return PelisBot()
+
+
+async def _boot(token: str):
+    """Importa y arranca el bot sin bloquear el event loop."""
+    loop = asyncio.get_running_loop()
+    bot = await loop.run_in_executor(None, _import_and_construct)
+    async with bot:
+        await bot.start(token)
+
+
 def main():
     """Punto de entrada principal del bot."""
     # Configurar logging antes de cualquier otra cosa
     setup_logging()
-    
+
     logger = get_logger(__name__)
     logger.info("Iniciando Pelis Bot...")
-    
+
     try:
-        from src.bot import PelisBot
+        # Verificar configuración antes de importar discord (import pesado)
         import config
-        
-        # Verificar configuración
+
         if not config.DISCORD_TOKEN:
             logger.error("DISCORD_TOKEN no configurado. Crea un archivo .env con el token.")
             sys.exit(1)
-        
+
         logger.info("Configuración cargada correctamente")
         logger.debug(f"Google Doc ID: {config.GOOGLE_DOC_ID}")
-        
-        # Iniciar bot
-        bot = PelisBot()
-        bot.run(config.DISCORD_TOKEN)
-        
+
+        # Iniciar bot (el import de discord ocurre dentro del executor)
+        asyncio.run(_boot(config.DISCORD_TOKEN))
+
+    except KeyboardInterrupt:
+        logger.info("Bot detenido manualmente")
     except ImportError as e:
         logger.error(f"Error de importación: {e}", exc_info=True)
         logger.error("Asegúrate de instalar las dependencias: pip install -r requirements.txt")
@@ -1,6 +1,13 @@
 """
 Módulo del bot de Discord.
 """
-from .client import PelisBot
 
 __all__ = ["PelisBot"]
+
+
+def __getattr__(name):
+    # Import perezoso (PEP 562): no cargar discord hasta que se pida el bot
+    if name == "PelisBot":
+        from .client import PelisBot
+        return PelisBot
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,7 @@
 """
 Cliente principal del bot de Discord.
 """
+import asyncio
 import discord
 from discord.ext import commands
 import logging
@@ -26,13 +27,24 @@ class PelisBot(commands.Bot):
     
     async def setup_hook(self):
         """Se ejecuta cuando el bot está listo para cargar extensiones."""
-        # Cargar cogs
-        await self.load_extension("src.bot.cogs.movies")
-        await self.load_extension("src.bot.cogs.voting")
-        
-        # Sincronizar comandos slash
-        await self.tree.sync()
-        logger.info("Comandos slash sincronizados")
+        # Un solo lector de Google Docs compartido por todos los cogs,
+        # para que compartan la caché de películas
+        from src.google_docs import MovieDocReader
+        self.doc_reader = MovieDocReader()
+
+        # Cargar cogs en paralelo
+        await asyncio.gather(
+            self.load_extension("src.bot.cogs.movies"),
+            self.load_extension("src.bot.cogs.voting"),
+        )
+
+        # Sincronizar comandos slash (desactivable en desarrollo:
+        # la sincronización global es una llamada REST pesada)
+        if config.SYNC_COMMANDS:
+            await self.tree.sync()
+            logger.info("Comandos slash sincronizados")
+        else:
+            logger.info("Sincronización de comandos slash omitida (SYNC_COMMANDS=0)")
     
     async def on_ready(self):
         """Se ejecuta cuando el bot está completamente conectado."""
@@ -55,7 +67,7 @@ class PelisBot(commands.Bot):
             await ctx.send("❌ No tienes permisos para usar este comando.")
             return
         
-        logger.error(f"Error en comando: {error}")
+        logger.error("Error en comando: %s", error, exc_info=error)
         await ctx.send(f"❌ Ocurrió un error: {str(error)}")
 
 
@@ -1,7 +1,6 @@
 """
 Cog para comandos de gestión de películas.
 """
-import random
 import discord
 from discord import app_commands
 from discord.ext import commands
@@ -19,7 +18,8 @@ class MoviesCog(commands.Cog):
     
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.doc_reader = MovieDocReader()
+        # Reutilizar el lector compartido del bot si existe
+        self.doc_reader = getattr(bot, "doc_reader", None) or MovieDocReader()
         logger.info("MoviesCog inicializado")
     
     def _get_guild_name(self, interaction: discord.Interaction) -> str:
@@ -49,15 +49,15 @@ class MoviesCog(commands.Cog):
             logger.debug(f"Obteniendo películas con filtro: {filtro}")
             
             if filtro == "todas":
-                movies = self.doc_reader.get_movies()
+                movies = await self.doc_reader.aget_movies()
                 title = "📽️ Todas las películas"
                 color = discord.Color.blue()
             elif filtro == "vistas":
-                movies = self.doc_reader.get_seen_movies()
+                movies = await self.doc_reader.aget_seen_movies()
                 title = "✅ Películas vistas"
                 color = discord.Color.green()
             else:
-                movies = self.doc_reader.get_pending_movies()
+                movies = await self.doc_reader.aget_pending_movies()
                 title = "⏳ Películas pendientes"
                 color = discord.Color.orange()
             
@@ -80,11 +80,11 @@ class MoviesCog(commands.Cog):
                 color=color
             )
             
-            await interaction.followup.send(embed=view.get_embed(), view=view)
+            view.message = await interaction.followup.send(embed=view.get_embed(), view=view)
             logger.debug(f"Lista enviada correctamente: {len(movies)} películas")
             
         except Exception as e:
-            logger.error(f"Error en comando listar: {e}", exc_info=True)
+            logger.error("Error en comando listar: %s", e, exc_info=True)
             await interaction.followup.send(f"❌ Error al obtener las películas: {str(e)}")
     
     @app_commands.command(name="elegir_azar", description="Elige una película al azar")
@@ -104,16 +104,15 @@ class MoviesCog(commands.Cog):
         try:
             if proponente:
                 logger.debug(f"Filtrando por proponente: {proponente}")
-                all_movies = self.doc_reader.get_movies_by_proponent(proponente)
-                movies = [m for m in all_movies if m.is_pending]
                 filter_text = f"propuestas por **{proponente}**"
             else:
-                movies = self.doc_reader.get_pending_movies()
                 filter_text = "pendientes"
-            
-            logger.debug(f"Películas disponibles para elegir: {len(movies)}")
-            
-            if not movies:
+
+            # Contar y elegir sin materializar la lista filtrada
+            count = await self.doc_reader.acount_pending(proponente)
+            logger.debug(f"Películas disponibles para elegir: {count}")
+
+            if not count:
                 embed = discord.Embed(
                     title="🎲 Sin resultados",
                     description=f"No hay películas {filter_text}.",
@@ -121,14 +120,24 @@ class MoviesCog(commands.Cog):
                 )
                 await interaction.followup.send(embed=embed)
                 return
-            
-            # Elegir al azar
-            movie = random.choice(movies)
-            logger.info(f"Película elegida al azar: '{movie.titulo}' de {len(movies)} opciones")
-            
+
+            # Elegir al azar. Puede devolver None si la lista cambió
+            # entre el conteo y la elección (p. ej. expiró la caché)
+            movie = await self.doc_reader.apick_random_pending(proponente)
+            if movie is None:
+                embed = discord.Embed(
+                    title="🎲 Sin resultados",
+                    description=f"No hay películas {filter_text}.",
+                    color=discord.Color.orange()
+                )
+                await interaction.followup.send(embed=embed)
+                return
+
+            logger.info(f"Película elegida al azar: '{movie.titulo}' de {count} opciones")
+
             embed = discord.Embed(
                 title="🎲 ¡Película elegida!",
-                description=f"De {len(movies)} películas {filter_text}:",
+                description=f"De {count} películas {filter_text}:",
                 color=discord.Color.green()
             )
             embed.add_field(name="🎬 Título", value=movie.titulo, inline=False)
@@ -137,10 +146,10 @@ class MoviesCog(commands.Cog):
             # Crear vista con botón para tachar
             view = StrikeMovieView(movie, self.doc_reader, interaction.user)
             
-            await interaction.followup.send(embed=embed, view=view)
+            view.message = await interaction.followup.send(embed=embed, view=view)
             
         except Exception as e:
-            logger.error(f"Error en comando elegir_azar: {e}", exc_info=True)
+            logger.error("Error en comando elegir_azar: %s", e, exc_info=True)
             await interaction.followup.send(f"❌ Error: {str(e)}")
     
     @app_commands.command(name="tachar", description="Tacha una película como vista")
@@ -159,7 +168,7 @@ class MoviesCog(commands.Cog):
         
         try:
             logger.debug(f"Buscando película: '{nombre}'")
-            matches = self.doc_reader.find_movie_by_title(nombre, pending_only=True)
+            matches = await self.doc_reader.afind_movie_by_title(nombre, pending_only=True)
             logger.debug(f"Coincidencias encontradas: {len(matches)}")
             
             if not matches:
@@ -185,7 +194,7 @@ class MoviesCog(commands.Cog):
                 embed.add_field(name="👤 Propuesta por", value=movie.proponente, inline=True)
                 
                 view = StrikeMovieView(movie, self.doc_reader, interaction.user)
-                await interaction.followup.send(embed=embed, view=view)
+                view.message = await interaction.followup.send(embed=embed, view=view)
             else:
                 # Múltiples coincidencias - mostrar selección
                 logger.debug(f"Múltiples coincidencias: {[m.titulo for m in matches[:5]]}")
@@ -204,10 +213,10 @@ class MoviesCog(commands.Cog):
                     )
                 
                 view = MovieSelectionView(matches[:10], self.doc_reader, interaction.user)
-                await interaction.followup.send(embed=embed, view=view)
+                view.message = await interaction.followup.send(embed=embed, view=view)
                 
         except Exception as e:
-            logger.error(f"Error en comando tachar: {e}", exc_info=True)
+            logger.error("Error en comando tachar: %s", e, exc_info=True)
             await interaction.followup.send(f"❌ Error: {str(e)}")
     
     @app_commands.command(name="buscar", description="Busca películas por título o proponente")
@@ -235,9 +244,9 @@ class MoviesCog(commands.Cog):
             logger.debug(f"Buscando por {tipo}: '{termino}'")
             
             if tipo == "proponente":
-                movies = self.doc_reader.get_movies_by_proponent(termino)
+                movies = await self.doc_reader.aget_movies_by_proponent(termino)
             else:
-                movies = self.doc_reader.find_movie_by_title(termino, pending_only=False)
+                movies = await self.doc_reader.afind_movie_by_title(termino, pending_only=False)
             
             logger.debug(f"Resultados encontrados: {len(movies)}")
             
@@ -258,10 +267,10 @@ class MoviesCog(commands.Cog):
                 color=discord.Color.blue()
             )
             
-            await interaction.followup.send(embed=view.get_embed(), view=view)
+            view.message = await interaction.followup.send(embed=view.get_embed(), view=view)
             
         except Exception as e:
-            logger.error(f"Error en comando buscar: {e}", exc_info=True)
+            logger.error("Error en comando buscar: %s", e, exc_info=True)
             await interaction.followup.send(f"❌ Error: {str(e)}")
 
 
@@ -3,8 +3,9 @@ Cog para el sistema de votación de películas.
 """
 import asyncio
 import random
-from datetime import datetime, timedelta
-from typing import Dict, List, Set
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
 import discord
 from discord import app_commands
 from discord.ext import commands
@@ -17,6 +18,21 @@ from src.utils.logger import BotLogger
 
 logger = BotLogger(__name__)
 
+# Intervalo mínimo entre ediciones del mensaje de votación
+UPDATE_DEBOUNCE_SECONDS = 0.75
+
+# Medallas para los tres primeros puestos del ranking
+RANK_ICONS = ("🥇", "🥈", "🥉")
+
+
+def _format_ranking(results) -> str:
+    """Formatea el ranking de resultados en una sola pasada."""
+    return "\n".join(
+        f"{RANK_ICONS[i] if i < 3 else f'{i + 1}.'} "
+        f"{movie.titulo} - {count} voto(s)"
+        for i, (movie, count) in enumerate(results)
+    )
+
 
 class VotingSession:
     """Representa una sesión de votación activa."""
@@ -34,16 +50,36 @@ class VotingSession:
         self.duration_minutes = duration_minutes
         self.channel_id = channel_id
         self.creator_id = creator_id
-        self.start_time = datetime.now()
-        self.end_time = self.start_time + timedelta(minutes=duration_minutes)
+        # Deadline monotónico: más barato que datetime.now() en cada refresco
+        self._deadline = time.monotonic() + duration_minutes * 60
         
         # Votos: {movie_index: set(user_ids)}
         self.votes: Dict[int, Set[int]] = {i: set() for i in range(len(movies))}
-        # Registro de votos por usuario: {user_id: [movie_indices]}
-        self.user_votes: Dict[int, List[int]] = {}
+        # Registro de votos por usuario: {user_id: set(movie_indices)}
+        self.user_votes: Dict[int, Set[int]] = defaultdict(set)
+        # Conteo incremental de votos por película + caché de resultados
+        self._counts: List[int] = [0] * len(movies)
+        self._results_cache: Optional[List[tuple]] = None
         
         self.is_active = True
         self.message: discord.Message = None
+        # Vista de botones, construida una sola vez por sesión
+        self.view = None
+
+        # Estado del debounce de actualizaciones del mensaje
+        self._update_pending = False
+        self._update_task: Optional[asyncio.Task] = None
+
+        # Coalescencia de ediciones: a lo sumo una edición en vuelo y una
+        # pendiente por sesión (ver update_voting_message)
+        self._edit_lock = asyncio.Lock()
+        self._dirty = False
+        # Conteos reflejados en la última edición del mensaje: si no
+        # cambiaron (p. ej. voto+desvoto rápidos), la edición se omite
+        self._last_counts: Optional[tuple] = None
+
+        # Handle del timer de expiración (cancelable)
+        self._timer: Optional[asyncio.TimerHandle] = None
     
     def add_vote(self, user_id: int, movie_index: int) -> tuple[bool, str]:
         """
@@ -63,15 +99,14 @@ class VotingSession:
             return False, "Ya votaste por esta película."
         
         # Verificar límite de votos
-        user_vote_count = len(self.user_votes.get(user_id, []))
-        if user_vote_count >= self.max_votes_per_user:
+        if len(self.user_votes[user_id]) >= self.max_votes_per_user:
             return False, f"Ya usaste tus {self.max_votes_per_user} voto(s)."
-        
+
         # Registrar voto
         self.votes[movie_index].add(user_id)
-        if user_id not in self.user_votes:
-            self.user_votes[user_id] = []
-        self.user_votes[user_id].append(movie_index)
+        self.user_votes[user_id].add(movie_index)
+        self._counts[movie_index] += 1
+        self._results_cache = None
         
         return True, f"¡Voto registrado para **{self.movies[movie_index].titulo}**!"
     
@@ -84,17 +119,54 @@ class VotingSession:
             return False, "No has votado por esta película."
         
         self.votes[movie_index].remove(user_id)
-        self.user_votes[user_id].remove(movie_index)
+        self.user_votes[user_id].discard(movie_index)
+        self._counts[movie_index] -= 1
+        self._results_cache = None
         
         return True, f"Voto removido de **{self.movies[movie_index].titulo}**."
     
+    def toggle_vote(self, user_id: int, movie_index: int) -> tuple[bool, str, bool]:
+        """
+        Alterna el voto de un usuario por una película.
+
+        Una sola búsqueda en el set decide si se añade o se quita,
+        sin la doble consulta membership + add/remove del llamador.
+
+        Returns:
+            Tuple (éxito, mensaje, removido)
+        """
+        if not self.is_active:
+            return False, "La votación ha terminado.", False
+
+        if movie_index < 0 or movie_index >= len(self.movies):
+            return False, "Película no válida.", False
+
+        voters = self.votes[movie_index]
+        if user_id in voters:
+            voters.remove(user_id)
+            self.user_votes[user_id].discard(movie_index)
+            self._counts[movie_index] -= 1
+            self._results_cache = None
+            return True, f"Voto removido de **{self.movies[movie_index].titulo}**.", True
+
+        if len(self.user_votes[user_id]) >= self.max_votes_per_user:
+            return False, f"Ya usaste tus {self.max_votes_per_user} voto(s).", False
+
+        voters.add(user_id)
+        self.user_votes[user_id].add(movie_index)
+        self._counts[movie_index] += 1
+        self._results_cache = None
+        return True, f"¡Voto registrado para **{self.movies[movie_index].titulo}**!", False
+
     def get_results(self) -> List[tuple[Movie, int]]:
-        """Obtiene los resultados ordenados por votos."""
-        results = [
-            (self.movies[i], len(voters))
-            for i, voters in self.votes.items()
-        ]
-        return sorted(results, key=lambda x: x[1], reverse=True)
+        """Obtiene los resultados ordenados por votos (cacheados)."""
+        if self._results_cache is None:
+            self._results_cache = sorted(
+                zip(self.movies, self._counts),
+                key=lambda x: x[1],
+                reverse=True
+            )
+        return self._results_cache
     
     def get_winner(self) -> tuple[Movie, int]:
         """Obtiene la película ganadora."""
@@ -116,10 +188,9 @@ class VotingSession:
         tied = [movie for movie, votes in results if votes == max_votes]
         return tied if len(tied) > 1 else []
     
-    def time_remaining(self) -> timedelta:
-        """Retorna el tiempo restante de la votación."""
-        remaining = self.end_time - datetime.now()
-        return remaining if remaining.total_seconds() > 0 else timedelta(0)
+    def time_remaining(self) -> float:
+        """Retorna el tiempo restante de la votación en segundos."""
+        return max(0.0, self._deadline - time.monotonic())
 
 
 class VotingCog(commands.Cog):
@@ -127,9 +198,14 @@ class VotingCog(commands.Cog):
     
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.doc_reader = MovieDocReader()
+        # Reutilizar el lector compartido del bot si existe
+        self.doc_reader = getattr(bot, "doc_reader", None) or MovieDocReader()
         # Sesiones activas por canal
         self.active_sessions: Dict[int, VotingSession] = {}
+        # Los botones de voto son DynamicItems: una sola registración
+        # global, sin retener una vista por sesión
+        from src.bot.views.voting_views import VoteButton
+        bot.add_dynamic_items(VoteButton)
         logger.info("VotingCog inicializado")
     
     def _get_guild_name(self, interaction: discord.Interaction) -> str:
@@ -189,12 +265,12 @@ class VotingCog(commands.Cog):
         try:
             # Obtener películas pendientes (filtrar por proponente si se especifica)
             if proponente:
-                all_movies = self.doc_reader.get_movies_by_proponent(proponente)
+                all_movies = await self.doc_reader.aget_movies_by_proponent(proponente)
                 pending_movies = [m for m in all_movies if m.is_pending]
                 filter_text = f" de **{proponente}**"
                 logger.debug(f"Filtrando por proponente: {proponente}")
             else:
-                pending_movies = self.doc_reader.get_pending_movies()
+                pending_movies = await self.doc_reader.aget_pending_movies()
                 filter_text = ""
             logger.debug(f"Películas pendientes disponibles: {len(pending_movies)}")
             
@@ -230,19 +306,23 @@ class VotingCog(commands.Cog):
             # Crear embed de votación
             embed = self._create_voting_embed(session)
             
-            # Crear vista con botones
+            # Crear vista con botones (una sola vez por sesión)
             view = VotingView(session, self)
-            
+            session.view = view
+
             message = await interaction.followup.send(embed=embed, view=view)
             session.message = message
-            
-            # Programar fin de votación
-            self.bot.loop.create_task(
-                self._end_voting_after(session, tiempo * 60)
+
+            # Los botones son DynamicItems: siguen respondiendo aunque la
+            # vista no esté en memoria, sin registración por mensaje
+
+            # Programar fin de votación (timer cancelable)
+            session._timer = self.bot.loop.call_later(
+                tiempo * 60, self._on_voting_expired, session
             )
             
         except Exception as e:
-            logger.error(f"Error al iniciar votación: {e}", exc_info=True)
+            logger.error("Error al iniciar votación: %s", e, exc_info=True)
             await interaction.followup.send(f"❌ Error al iniciar votación: {str(e)}")
     
     def _create_voting_embed(self, session: VotingSession) -> discord.Embed:
@@ -251,14 +331,14 @@ class VotingCog(commands.Cog):
             title="🗳️ ¡Votación de películas!",
             description=(
                 f"**Votos por persona:** {session.max_votes_per_user}\n"
-                f"**Tiempo restante:** {int(session.time_remaining().total_seconds() // 60)} minutos\n\n"
+                f"**Tiempo restante:** {int(session.time_remaining() // 60)} minutos\n\n"
                 "Haz clic en los botones para votar:"
             ),
             color=discord.Color.purple()
         )
         
         for i, movie in enumerate(session.movies):
-            vote_count = len(session.votes[i])
+            vote_count = session._counts[i]
             embed.add_field(
                 name=f"{i + 1}. {movie.titulo}",
                 value=f"👤 {movie.proponente} | 🗳️ {vote_count} voto(s)",
@@ -268,26 +348,87 @@ class VotingCog(commands.Cog):
         embed.set_footer(text="Los votos se actualizan en tiempo real")
         return embed
     
+    def schedule_update(self, session: VotingSession):
+        """
+        Agenda una actualización del mensaje de votación con debounce.
+
+        Ráfagas de votos casi simultáneos se colapsan en una sola edición
+        del mensaje, en lugar de una llamada HTTP por voto.
+        """
+        session._update_pending = True
+        if session._update_task is None or session._update_task.done():
+            session._update_task = self.bot.loop.create_task(
+                self._debounced_update(session)
+            )
+
+    async def _debounced_update(self, session: VotingSession):
+        """Loop de debounce: edita el mensaje mientras haya cambios pendientes."""
+        while session._update_pending:
+            session._update_pending = False
+            await asyncio.sleep(UPDATE_DEBOUNCE_SECONDS)
+            await self.update_voting_message(session)
+
     async def update_voting_message(self, session: VotingSession):
-        """Actualiza el mensaje de votación con los votos actuales."""
-        if session.message:
+        """
+        Actualiza el mensaje de votación con los votos actuales.
+
+        Llamadas concurrentes se coalescen: si ya hay una edición en
+        vuelo, solo se marca la sesión como sucia y la edición en curso
+        re-edita una vez más al terminar. N llamadas por segundo se
+        convierten en ≤1 en vuelo + 1 encolada.
+        """
+        if not session.message:
+            return
+
+        session._dirty = True
+        if session._edit_lock.locked():
+            return
+
+        async with session._edit_lock:
             try:
-                embed = self._create_voting_embed(session)
-                view = VotingView(session, self)
-                await session.message.edit(embed=embed, view=view)
+                while session._dirty:
+                    session._dirty = False
+                    # Voto y desvoto rápidos pueden dejar los conteos como
+                    # estaban: en ese caso no hay nada que editar
+                    counts = tuple(session._counts)
+                    if counts == session._last_counts:
+                        continue
+                    embed = self._create_voting_embed(session)
+                    await session.message.edit(embed=embed, view=session.view)
+                    session._last_counts = counts
             except discord.NotFound:
                 logger.warning("Mensaje de votación no encontrado al actualizar")
             except Exception as e:
-                logger.error(f"Error al actualizar mensaje de votación: {e}", exc_info=True)
+                logger.error("Error al actualizar mensaje de votación: %s", e, exc_info=True)
     
-    async def _end_voting_after(self, session: VotingSession, seconds: int):
-        """Finaliza la votación después del tiempo especificado."""
-        await asyncio.sleep(seconds)
-        
-        if not session.is_active:
-            logger.debug("Votación ya terminada, ignorando fin programado")
+    async def _disable_session_view(self, session: VotingSession):
+        """Deshabilita los botones del mensaje de votación y libera la vista."""
+        if not session.message:
             return
-        
+        try:
+            if session.view:
+                for child in session.view.children:
+                    child.disabled = True
+                await session.message.edit(view=session.view)
+            else:
+                await session.message.edit(view=None)
+        except Exception:
+            pass
+        # Detener la vista para desregistrarla del dispatcher del bot
+        if session.view:
+            session.view.stop()
+        session.view = None
+
+    def _on_voting_expired(self, session: VotingSession):
+        """Callback del timer: agenda la finalización de la votación.
+
+        Se ejecuta solo si el timer no fue cancelado, así que no hace
+        falta re-verificar is_active.
+        """
+        self.bot.loop.create_task(self._finalize_voting(session))
+
+    async def _finalize_voting(self, session: VotingSession):
+        """Finaliza la votación cuando expira el tiempo."""
         session.is_active = False
         logger.debug(f"Finalizando votación en canal {session.channel_id}")
         
@@ -308,10 +449,7 @@ class VotingCog(commands.Cog):
         from src.bot.views.voting_views import TieBreakView
         
         results = session.get_results()
-        max_votes = len(session.votes[0]) if session.votes else 0
-        for i, voters in session.votes.items():
-            if len(voters) > max_votes:
-                max_votes = len(voters)
+        max_votes = max(session._counts, default=0)
         
         # Crear embed de empate
         embed = discord.Embed(
@@ -329,11 +467,7 @@ class VotingCog(commands.Cog):
         )
         
         # Mostrar ranking completo
-        ranking = "\n".join([
-            f"{'🥇' if i == 0 else '🥈' if i == 1 else '🥉' if i == 2 else f'{i+1}.'} "
-            f"{movie.titulo} - {count} voto(s)"
-            for i, (movie, count) in enumerate(results)
-        ])
+        ranking = _format_ranking(results)
         embed.add_field(name="📊 Resultados", value=ranking, inline=False)
         
         embed.add_field(
@@ -349,12 +483,11 @@ class VotingCog(commands.Cog):
             channel = self.bot.get_channel(session.channel_id)
             if channel:
                 await channel.send(embed=embed, view=view)
-                
+
                 # Deshabilitar botones del mensaje original
-                if session.message:
-                    await session.message.edit(view=None)
+                await self._disable_session_view(session)
         except Exception as e:
-            logger.error(f"Error al manejar empate: {e}", exc_info=True)
+            logger.error("Error al manejar empate: %s", e, exc_info=True)
         
         # Limpiar sesión (la nueva votación creará una nueva si es necesario)
         if session.channel_id in self.active_sessions:
@@ -389,11 +522,7 @@ class VotingCog(commands.Cog):
             )
             
             # Mostrar ranking completo
-            ranking = "\n".join([
-                f"{'🥇' if i == 0 else '🥈' if i == 1 else '🥉' if i == 2 else f'{i+1}.'} "
-                f"{movie.titulo} - {count} voto(s)"
-                for i, (movie, count) in enumerate(results)
-            ])
+            ranking = _format_ranking(results)
             embed.add_field(name="📊 Resultados", value=ranking, inline=False)
         else:
             embed.description = "No hubo votos en esta votación."
@@ -408,12 +537,11 @@ class VotingCog(commands.Cog):
             channel = self.bot.get_channel(session.channel_id)
             if channel:
                 await channel.send(embed=embed, view=view)
-                
+
                 # Deshabilitar botones del mensaje original
-                if session.message:
-                    await session.message.edit(view=None)
+                await self._disable_session_view(session)
         except Exception as e:
-            logger.error(f"Error al finalizar votación: {e}", exc_info=True)
+            logger.error("Error al finalizar votación: %s", e, exc_info=True)
         
         # Limpiar sesión
         if session.channel_id in self.active_sessions:
@@ -449,8 +577,10 @@ class VotingCog(commands.Cog):
             return
         
         session.is_active = False
+        if session._timer:
+            session._timer.cancel()
         del self.active_sessions[interaction.channel_id]
-        
+
         logger.action(
             "VOTING_CANCEL",
             user=str(interaction.user),
@@ -458,12 +588,8 @@ class VotingCog(commands.Cog):
             details="Votación cancelada manualmente"
         )
         
-        if session.message:
-            try:
-                await session.message.edit(view=None)
-            except:
-                pass
-        
+        await self._disable_session_view(session)
+
         await interaction.response.send_message("✅ Votación cancelada.")
     
     @app_commands.command(name="finalizar_votacion", description="Finaliza la votación y muestra los resultados")
@@ -494,9 +620,11 @@ class VotingCog(commands.Cog):
             )
             return
         
-        # Marcar como inactiva para evitar más votos
+        # Marcar como inactiva para evitar más votos y cancelar el timer
         session.is_active = False
-        
+        if session._timer:
+            session._timer.cancel()
+
         logger.action(
             "VOTING_FINISH_EARLY",
             user=str(interaction.user),
@@ -505,11 +633,7 @@ class VotingCog(commands.Cog):
         )
         
         # Deshabilitar botones del mensaje original
-        if session.message:
-            try:
-                await session.message.edit(view=None)
-            except:
-                pass
+        await self._disable_session_view(session)
         
         # Verificar si hay empate
         tied_movies = session.get_tied_winners()
@@ -539,11 +663,7 @@ class VotingCog(commands.Cog):
             )
             
             # Mostrar ranking completo
-            ranking = "\n".join([
-                f"{'🥇' if i == 0 else '🥈' if i == 1 else '🥉' if i == 2 else f'{i+1}.'} "
-                f"{movie.titulo} - {count} voto(s)"
-                for i, (movie, count) in enumerate(results)
-            ])
+            ranking = _format_ranking(results)
             embed.add_field(name="📊 Resultados", value=ranking, inline=False)
             
             embed.add_field(
@@ -589,11 +709,7 @@ class VotingCog(commands.Cog):
             )
             
             # Mostrar ranking completo
-            ranking = "\n".join([
-                f"{'🥇' if i == 0 else '🥈' if i == 1 else '🥉' if i == 2 else f'{i+1}.'} "
-                f"{movie.titulo} - {count} voto(s)"
-                for i, (movie, count) in enumerate(results)
-            ])
+            ranking = _format_ranking(results)
             embed.add_field(name="📊 Resultados", value=ranking, inline=False)
         else:
             embed.add_field(
@@ -634,8 +750,7 @@ class VotingCog(commands.Cog):
         embed = self._create_voting_embed(session)
         
         remaining = session.time_remaining()
-        minutes = int(remaining.total_seconds() // 60)
-        seconds = int(remaining.total_seconds() % 60)
+        minutes, seconds = divmod(int(remaining), 60)
         
         embed.set_footer(text=f"Tiempo restante: {minutes}m {seconds}s")
         
@@ -753,20 +868,21 @@ class VotingCog(commands.Cog):
             # Crear embed de votación
             embed = self._create_voting_embed(session)
             
-            # Crear vista con botones
+            # Crear vista con botones (una sola vez por sesión)
             view = VotingView(session, self)
-            
+            session.view = view
+
             # Editar el mensaje de configuración para mostrar la votación
             await interaction.response.edit_message(embed=embed, view=view)
             session.message = setup_message
-            
-            # Programar fin de votación
-            self.bot.loop.create_task(
-                self._end_voting_after(session, duration_minutes * 60)
+
+            # Programar fin de votación (timer cancelable)
+            session._timer = self.bot.loop.call_later(
+                duration_minutes * 60, self._on_voting_expired, session
             )
             
         except Exception as e:
-            logger.error(f"Error al iniciar votación manual: {e}", exc_info=True)
+            logger.error("Error al iniciar votación manual: %s", e, exc_info=True)
             await interaction.response.send_message(
                 f"❌ Error al iniciar votación: {str(e)}",
                 ephemeral=True
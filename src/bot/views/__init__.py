@@ -1,16 +1,34 @@
 """
 Vistas de UI de Discord (botones, menús, etc.)
 """
-from .movie_views import StrikeMovieView, MovieSelectionView
-from .voting_views import VotingView
-from .pagination import PaginationView
-from .voting_setup_view import VotingSetupView, MovieSearchModal
+import importlib
 
 __all__ = [
-    "StrikeMovieView", 
-    "MovieSelectionView", 
-    "VotingView", 
+    "StrikeMovieView",
+    "MovieSelectionView",
+    "VotingView",
     "PaginationView",
     "VotingSetupView",
     "MovieSearchModal"
 ]
+
+# Mapa de export -> submódulo, para imports perezosos (PEP 562)
+_LAZY = {
+    "StrikeMovieView": ".movie_views",
+    "MovieSelectionView": ".movie_views",
+    "VotingView": ".voting_views",
+    "PaginationView": ".pagination",
+    "VotingSetupView": ".voting_setup_view",
+    "MovieSearchModal": ".voting_setup_view",
+}
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(module_name, __name__)
+    value = getattr(module, name)
+    globals()[name] = value  # cachear para accesos posteriores
+    return value
@@ -0,0 +1,55 @@
+"""
+Control de concurrencia para llamadas a Google Docs desde las vistas.
+
+Varias vistas activas (tachados, configuración de votaciones) pueden
+disparar llamadas a la API de Docs en paralelo, y Google responde con
+429/503 bajo carga concurrente. Este módulo serializa parcialmente esas
+llamadas con un semáforo global y reintenta con backoff exponencial.
+"""
+import asyncio
+import random
+
+from src.utils.logger import BotLogger
+
+logger = BotLogger(__name__)
+
+# Máximo de llamadas a Docs en vuelo a la vez
+DOCS_SEM = asyncio.Semaphore(3)
+
+# Reintentos ante errores transitorios de la API
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 0.5  # segundos
+
+
+async def gated_call(fn, *args, **kwargs):
+    """
+    Ejecuta una llamada síncrona a Docs en un hilo, limitando la
+    concurrencia global y reintentando errores transitorios.
+
+    Args:
+        fn: Función síncrona a ejecutar (ej: doc_reader.strike_movie)
+        *args, **kwargs: Argumentos para la función
+
+    Returns:
+        El resultado de fn
+
+    Raises:
+        La última excepción si se agotan los reintentos. Los ValueError
+        (errores de lógica, ej: película no encontrada) no se reintentan.
+    """
+    async with DOCS_SEM:
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                return await asyncio.to_thread(fn, *args, **kwargs)
+            except ValueError:
+                # Error de lógica, reintentar no va a ayudar
+                raise
+            except Exception as e:
+                if attempt == MAX_ATTEMPTS:
+                    raise
+                delay = BACKOFF_BASE * (2 ** (attempt - 1)) + random.uniform(0, 0.25)
+                logger.warning(
+                    "Llamada a Docs falló (intento %d/%d), reintentando en %.2fs: %s",
+                    attempt, MAX_ATTEMPTS, delay, e
+                )
+                await asyncio.sleep(delay)
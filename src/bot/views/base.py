@@ -0,0 +1,30 @@
+"""
+Utilidades compartidas por las vistas del bot.
+"""
+import discord
+
+
+class TimeoutDisableMixin:
+    """
+    Mixin para vistas que deben deshabilitar sus controles al expirar.
+
+    Si la vista conoce su mensaje (atributo `message`), además edita el
+    mensaje para que el cliente de Discord deje de mostrar controles
+    muertos (y deje de enviar interacciones condenadas a fallar).
+    """
+
+    __slots__ = ()
+
+    async def on_timeout(self):
+        self._disable_all()
+        message = getattr(self, "message", None)
+        if message:
+            try:
+                await message.edit(view=self)
+            except discord.HTTPException:
+                pass
+
+    def _disable_all(self):
+        """Deshabilita todos los controles de la vista."""
+        for child in self.children:
+            child.disabled = True
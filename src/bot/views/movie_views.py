@@ -1,6 +1,8 @@
 """
 Vistas relacionadas con películas (botones de tachar, selección, etc.)
 """
+import uuid
+
 import discord
 from discord.ui import View, Button, Select
 from typing import List, Optional
@@ -8,12 +10,26 @@ from typing import List, Optional
 from src.models import Movie
 from src.google_docs import MovieDocReader
 from src.utils.logger import BotLogger
+from src.bot.views._docs_gate import gated_call
+from src.bot.views.base import TimeoutDisableMixin
 
 logger = BotLogger(__name__)
 
+# Embed estático de cancelación: se construye una vez y se copia por uso
+_CANCELLED_EMBED = discord.Embed(
+    title="❌ Cancelado",
+    description="No se tachó ninguna película.",
+    color=discord.Color.greyple()
+)
+
 
-class StrikeMovieView(View):
+class StrikeMovieView(TimeoutDisableMixin, View):
     """Vista con botón para tachar una película."""
+
+    __slots__ = (
+        "movie", "doc_reader", "requester", "message",
+        "confirm_button", "cancel_button",
+    )
     
     def __init__(
         self,
@@ -27,6 +43,7 @@ class StrikeMovieView(View):
         self.movie = movie
         self.doc_reader = doc_reader
         self.requester = requester
+        self.message: Optional[discord.Message] = None
         
         # Botón de confirmar
         self.confirm_button = Button(
@@ -48,11 +65,16 @@ class StrikeMovieView(View):
     
     async def confirm_callback(self, interaction: discord.Interaction):
         """Callback cuando se confirma el tachado."""
+        # ACK inmediato: la escritura en Google Docs puede superar los
+        # 3 segundos que Discord espera antes de invalidar la interacción
+        await interaction.response.defer()
+
         try:
-            logger.debug(f"Intentando tachar película: '{self.movie.titulo}'")
-            
-            # Tachar la película en Google Docs
-            self.doc_reader.strike_movie(self.movie)
+            logger.debug("Intentando tachar película: '%s'", self.movie.titulo)
+
+            # Tachar la película en Google Docs (en un hilo aparte y con
+            # concurrencia acotada para no saturar la API)
+            await gated_call(self.doc_reader.strike_movie, self.movie)
             
             embed = discord.Embed(
                 title="✅ Película tachada",
@@ -76,41 +98,37 @@ class StrikeMovieView(View):
             # Deshabilitar botones
             self.confirm_button.disabled = True
             self.cancel_button.disabled = True
-            
-            await interaction.response.edit_message(embed=embed, view=self)
-            
+
+            await interaction.edit_original_response(embed=embed, view=self)
+
         except Exception as e:
-            logger.error(f"Error al tachar película '{self.movie.titulo}': {e}", exc_info=True)
-            await interaction.response.send_message(
+            logger.error("Error al tachar película '%s': %s", self.movie.titulo, e, exc_info=True)
+            await interaction.followup.send(
                 f"❌ Error al tachar la película: {str(e)}",
                 ephemeral=True
             )
     
     async def cancel_callback(self, interaction: discord.Interaction):
         """Callback cuando se cancela el tachado."""
-        logger.debug(f"Tachado cancelado para película: '{self.movie.titulo}'")
-        
-        embed = discord.Embed(
-            title="❌ Cancelado",
-            description="No se tachó ninguna película.",
-            color=discord.Color.greyple()
-        )
-        
+        logger.debug("Tachado cancelado para película: '%s'", self.movie.titulo)
+
+        embed = _CANCELLED_EMBED.copy()
+
         # Deshabilitar botones
         self.confirm_button.disabled = True
         self.cancel_button.disabled = True
         
         await interaction.response.edit_message(embed=embed, view=self)
-    
-    async def on_timeout(self):
-        """Se ejecuta cuando expira el timeout de la vista."""
-        self.confirm_button.disabled = True
-        self.cancel_button.disabled = True
 
 
-class MovieSelectionView(View):
-    """Vista con menú desplegable para seleccionar una película de múltiples opciones."""
-    
+class MovieSelectionView(TimeoutDisableMixin, View):
+    """Vista con menú desplegable para seleccionar películas de múltiples opciones."""
+
+    __slots__ = (
+        "movies", "doc_reader", "requester", "selected_movies", "message",
+        "_by_id", "select_menu", "confirm_button", "cancel_button",
+    )
+
     def __init__(
         self,
         movies: List[Movie],
@@ -122,23 +140,28 @@ class MovieSelectionView(View):
         self.movies = movies
         self.doc_reader = doc_reader
         self.requester = requester
-        self.selected_movie: Optional[Movie] = None
-        
+        self.selected_movies: List[Movie] = []
+        self.message: Optional[discord.Message] = None
+
+        # Mapear cada opción a su película con un id estable: el lookup es
+        # O(1) y no depende del orden ni del recorte a 25 opciones
+        self._by_id = {uuid.uuid4().hex: movie for movie in movies[:25]}
+
         # Crear opciones del menú
         options = [
             discord.SelectOption(
                 label=movie.titulo[:100],  # Límite de Discord
                 description=f"Por: {movie.proponente}"[:100],
-                value=str(i)
+                value=option_id
             )
-            for i, movie in enumerate(movies[:25])  # Máximo 25 opciones
+            for option_id, movie in self._by_id.items()
         ]
-        
+
         self.select_menu = Select(
-            placeholder="Selecciona una película...",
+            placeholder="Selecciona una o varias películas...",
             options=options,
             min_values=1,
-            max_values=1
+            max_values=len(options)
         )
         self.select_menu.callback = self.select_callback
         self.add_item(self.select_menu)
@@ -163,87 +186,85 @@ class MovieSelectionView(View):
         self.add_item(self.cancel_button)
     
     async def select_callback(self, interaction: discord.Interaction):
-        """Callback cuando se selecciona una película del menú."""
-        selected_index = int(self.select_menu.values[0])
-        self.selected_movie = self.movies[selected_index]
+        """Callback cuando se seleccionan películas del menú."""
+        self.selected_movies = [
+            self._by_id[value] for value in self.select_menu.values
+        ]
         self.confirm_button.disabled = False
-        
-        logger.debug(f"Película seleccionada del menú: '{self.selected_movie.titulo}'")
-        
+
+        logger.debug("Películas seleccionadas del menú: %d", len(self.selected_movies))
+
+        selected_list = "\n".join(f"• **{m.titulo}** *(por {m.proponente})*" for m in self.selected_movies)
         embed = discord.Embed(
-            title="🎬 Película seleccionada",
-            description=f"Has seleccionado: **{self.selected_movie.titulo}**\n"
-                       f"Propuesta por: {self.selected_movie.proponente}\n\n"
-                       "Haz clic en 'Confirmar tachado' para marcarla como vista.",
+            title="🎬 Películas seleccionadas",
+            description=f"Has seleccionado:\n{selected_list}\n\n"
+                       "Haz clic en 'Confirmar tachado' para marcarlas como vistas.",
             color=discord.Color.blue()
         )
-        
+
         await interaction.response.edit_message(embed=embed, view=self)
-    
+
     async def confirm_callback(self, interaction: discord.Interaction):
         """Callback cuando se confirma el tachado."""
-        if not self.selected_movie:
+        if not self.selected_movies:
             await interaction.response.send_message(
-                "❌ Primero selecciona una película.",
+                "❌ Primero selecciona al menos una película.",
                 ephemeral=True
             )
             return
-        
+
+        # ACK inmediato: la escritura en Google Docs puede superar los
+        # 3 segundos que Discord espera antes de invalidar la interacción
+        await interaction.response.defer()
+
         try:
-            logger.debug(f"Tachando película desde selección: '{self.selected_movie.titulo}'")
-            self.doc_reader.strike_movie(self.selected_movie)
-            
+            logger.debug("Tachando %d película(s) desde selección", len(self.selected_movies))
+            # Un solo batchUpdate para todas las seleccionadas
+            await gated_call(self.doc_reader.strike_movies_batch, self.selected_movies)
+
+            struck_list = "\n".join(f"• **{m.titulo}**" for m in self.selected_movies)
             embed = discord.Embed(
-                title="✅ Película tachada",
-                description=f"**{self.selected_movie.titulo}** ha sido marcada como vista.",
+                title="✅ Película(s) tachada(s)",
+                description=f"Marcadas como vistas:\n{struck_list}",
                 color=discord.Color.green()
             )
             embed.add_field(
-                name="Tachada por",
+                name="Tachadas por",
                 value=interaction.user.mention,
                 inline=True
             )
-            
+
             # Log de acción
             guild_name = interaction.guild.name if interaction.guild else "DM"
-            logger.movie_strike(
-                movie_title=self.selected_movie.titulo,
-                user=str(interaction.user),
-                guild=guild_name
-            )
-            
+            for movie in self.selected_movies:
+                logger.movie_strike(
+                    movie_title=movie.titulo,
+                    user=str(interaction.user),
+                    guild=guild_name
+                )
+
             # Deshabilitar todo
             self.select_menu.disabled = True
             self.confirm_button.disabled = True
             self.cancel_button.disabled = True
-            
-            await interaction.response.edit_message(embed=embed, view=self)
-            
+
+            await interaction.edit_original_response(embed=embed, view=self)
+
         except Exception as e:
-            logger.error(f"Error al tachar película '{self.selected_movie.titulo}': {e}", exc_info=True)
-            await interaction.response.send_message(
-                f"❌ Error al tachar la película: {str(e)}",
+            logger.error("Error al tachar películas seleccionadas: %s", e, exc_info=True)
+            await interaction.followup.send(
+                f"❌ Error al tachar: {str(e)}",
                 ephemeral=True
             )
     
     async def cancel_callback(self, interaction: discord.Interaction):
         """Callback cuando se cancela."""
         logger.debug("Selección de película cancelada")
-        
-        embed = discord.Embed(
-            title="❌ Cancelado",
-            description="No se tachó ninguna película.",
-            color=discord.Color.greyple()
-        )
-        
+
+        embed = _CANCELLED_EMBED.copy()
+
         self.select_menu.disabled = True
         self.confirm_button.disabled = True
         self.cancel_button.disabled = True
-        
+
         await interaction.response.edit_message(embed=embed, view=self)
-    
-    async def on_timeout(self):
-        """Se ejecuta cuando expira el timeout."""
-        self.select_menu.disabled = True
-        self.confirm_button.disabled = True
-        self.cancel_button.disabled = True
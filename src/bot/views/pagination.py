@@ -3,17 +3,26 @@ Vista de paginación para listas largas.
 """
 import discord
 from discord.ui import View, Button
+from itertools import islice
 from typing import List, Callable, Any
 import logging
 
+from src.bot.views.base import TimeoutDisableMixin
+
 logger = logging.getLogger(__name__)
 
 # Películas por página
 ITEMS_PER_PAGE = 10
 
 
-class PaginationView(View):
+class PaginationView(TimeoutDisableMixin, View):
     """Vista con botones de paginación para listas largas."""
+
+    __slots__ = (
+        "items", "title", "formatter", "color", "items_per_page",
+        "current_page", "_n", "total_pages", "message", "_embed_cache",
+        "_first_btn", "_prev_btn", "_page_indicator", "_next_btn", "_last_btn",
+    )
     
     def __init__(
         self,
@@ -40,109 +49,113 @@ class PaginationView(View):
         self.color = color
         self.items_per_page = items_per_page
         self.current_page = 0
-        self.total_pages = max(1, (len(items) + items_per_page - 1) // items_per_page)
-        
-        self._update_buttons()
-    
-    def _update_buttons(self):
-        """Actualiza el estado de los botones según la página actual."""
-        self.clear_items()
-        
-        # Botón primera página
-        first_btn = Button(
-            emoji="⏮️",
-            style=discord.ButtonStyle.secondary,
-            disabled=self.current_page == 0
-        )
-        first_btn.callback = self.first_page
-        self.add_item(first_btn)
-        
-        # Botón página anterior
-        prev_btn = Button(
-            emoji="◀️",
-            style=discord.ButtonStyle.primary,
-            disabled=self.current_page == 0
-        )
-        prev_btn.callback = self.prev_page
-        self.add_item(prev_btn)
-        
-        # Indicador de página
-        page_indicator = Button(
-            label=f"{self.current_page + 1}/{self.total_pages}",
+        # items no muta durante la vida de la vista: cachear su tamaño
+        self._n = len(items)
+        self.total_pages = max(1, -(-self._n // items_per_page))
+        self.message = None
+        # Embeds ya generados, por página: items no cambia durante la vida
+        # de la vista, así que cada página solo se formatea una vez
+        self._embed_cache: dict = {}
+
+        # Crear los botones una sola vez; las navegaciones solo actualizan
+        # su estado (disabled/label) en lugar de reconstruir la vista
+        self._first_btn = Button(emoji="⏮️", style=discord.ButtonStyle.secondary)
+        self._first_btn.callback = self.first_page
+        self.add_item(self._first_btn)
+
+        self._prev_btn = Button(emoji="◀️", style=discord.ButtonStyle.primary)
+        self._prev_btn.callback = self.prev_page
+        self.add_item(self._prev_btn)
+
+        self._page_indicator = Button(
+            label="",
             style=discord.ButtonStyle.secondary,
             disabled=True
         )
-        self.add_item(page_indicator)
-        
-        # Botón página siguiente
-        next_btn = Button(
-            emoji="▶️",
-            style=discord.ButtonStyle.primary,
-            disabled=self.current_page >= self.total_pages - 1
-        )
-        next_btn.callback = self.next_page
-        self.add_item(next_btn)
-        
-        # Botón última página
-        last_btn = Button(
-            emoji="⏭️",
-            style=discord.ButtonStyle.secondary,
-            disabled=self.current_page >= self.total_pages - 1
-        )
-        last_btn.callback = self.last_page
-        self.add_item(last_btn)
+        self.add_item(self._page_indicator)
+
+        self._next_btn = Button(emoji="▶️", style=discord.ButtonStyle.primary)
+        self._next_btn.callback = self.next_page
+        self.add_item(self._next_btn)
+
+        self._last_btn = Button(emoji="⏭️", style=discord.ButtonStyle.secondary)
+        self._last_btn.callback = self.last_page
+        self.add_item(self._last_btn)
+
+        self._update_buttons()
+
+    def _update_buttons(self):
+        """Actualiza el estado de los botones según la página actual."""
+        at_first = self.current_page == 0
+        at_last = self.current_page >= self.total_pages - 1
+
+        self._first_btn.disabled = at_first
+        self._prev_btn.disabled = at_first
+        self._page_indicator.label = f"{self.current_page + 1}/{self.total_pages}"
+        self._next_btn.disabled = at_last
+        self._last_btn.disabled = at_last
     
     def get_embed(self) -> discord.Embed:
-        """Genera el embed para la página actual."""
+        """Genera el embed para la página actual (con caché por página)."""
+        cached = self._embed_cache.get(self.current_page)
+        if cached is not None:
+            return cached
+
         start_idx = self.current_page * self.items_per_page
         end_idx = start_idx + self.items_per_page
-        page_items = self.items[start_idx:end_idx]
-        
+        # islice evita copiar la página en una lista intermedia
+        page_items = islice(self.items, start_idx, end_idx)
+
         embed = discord.Embed(
             title=self.title,
-            description=f"Total: **{len(self.items)}** películas",
+            description=f"Total: **{self._n}** películas",
             color=self.color
         )
         
-        # Formatear items con números
-        formatted_items = []
-        for i, item in enumerate(page_items, start=start_idx + 1):
-            formatted_items.append(f"`{i}.` {self.formatter(item)}")
-        
-        content = "\n".join(formatted_items) if formatted_items else "No hay elementos."
+        # Formatear items con números, sin lista intermedia
+        content = "\n".join(
+            f"`{i}.` {self.formatter(item)}"
+            for i, item in enumerate(page_items, start=start_idx + 1)
+        ) or "No hay elementos."
         embed.add_field(name="Lista", value=content, inline=False)
         
         embed.set_footer(
             text=f"Página {self.current_page + 1} de {self.total_pages} • "
-                 f"Mostrando {start_idx + 1}-{min(end_idx, len(self.items))} de {len(self.items)}"
+                 f"Mostrando {start_idx + 1}-{min(end_idx, self._n)} de {self._n}"
         )
-        
+
+        self._embed_cache[self.current_page] = embed
         return embed
     
     async def first_page(self, interaction: discord.Interaction):
         """Ir a la primera página."""
+        if self.current_page == 0:
+            # Ya estamos ahí: ACK sin editar el mensaje
+            return await interaction.response.defer()
         self.current_page = 0
         self._update_buttons()
         await interaction.response.edit_message(embed=self.get_embed(), view=self)
-    
+
     async def prev_page(self, interaction: discord.Interaction):
         """Ir a la página anterior."""
-        self.current_page = max(0, self.current_page - 1)
+        if self.current_page == 0:
+            return await interaction.response.defer()
+        self.current_page -= 1
         self._update_buttons()
         await interaction.response.edit_message(embed=self.get_embed(), view=self)
-    
+
     async def next_page(self, interaction: discord.Interaction):
         """Ir a la página siguiente."""
-        self.current_page = min(self.total_pages - 1, self.current_page + 1)
+        if self.current_page >= self.total_pages - 1:
+            return await interaction.response.defer()
+        self.current_page += 1
         self._update_buttons()
         await interaction.response.edit_message(embed=self.get_embed(), view=self)
-    
+
     async def last_page(self, interaction: discord.Interaction):
         """Ir a la última página."""
+        if self.current_page >= self.total_pages - 1:
+            return await interaction.response.defer()
         self.current_page = self.total_pages - 1
         self._update_buttons()
         await interaction.response.edit_message(embed=self.get_embed(), view=self)
-    
-    async def on_timeout(self):
-        """Deshabilitar botones cuando expira el timeout."""
-        self.clear_items()
@@ -3,12 +3,18 @@ Vistas para la configuración de votaciones manuales.
 """
 import discord
 from discord.ui import View, Button, Modal, TextInput, Select
+from collections import defaultdict
+from functools import wraps
 from typing import List, Optional, Callable, TYPE_CHECKING
 import asyncio
+import time
+import uuid
 
 from src.models import Movie
 from src.google_docs import MovieDocReader
 from src.utils.logger import BotLogger
+from src.bot.views._docs_gate import gated_call
+from src.bot.views.base import TimeoutDisableMixin
 
 if TYPE_CHECKING:
     from src.bot.cogs.voting import VotingCog
@@ -19,6 +25,39 @@ logger = BotLogger(__name__)
 MAX_MOVIES_IN_VOTING = 10
 MIN_MOVIES_IN_VOTING = 2
 
+# Tiempo (segundos) que se reutilizan resultados de búsqueda repetidos
+SEARCH_CACHE_TTL = 30.0
+
+# Embeds estáticos: se construyen una vez y se copian por uso
+_CANCELLED_EMBED = discord.Embed(
+    title="❌ Configuración cancelada",
+    description="La votación manual ha sido cancelada.",
+    color=discord.Color.greyple()
+)
+
+_TIMEOUT_EMBED = discord.Embed(
+    title="⏰ Tiempo agotado",
+    description="La configuración de la votación ha expirado.",
+    color=discord.Color.greyple()
+)
+
+# Mensaje de permiso compartido por todos los controles de la vista
+_MSG_CREATOR_ONLY = "❌ Solo el creador de la votación puede configurarla."
+
+
+def _creator_only(fn):
+    """Restringe un callback de VotingSetupView al creador de la votación."""
+    @wraps(fn)
+    async def wrapper(self, interaction: discord.Interaction):
+        if interaction.user.id != self.creator.id:
+            await interaction.response.send_message(
+                _MSG_CREATOR_ONLY,
+                ephemeral=True
+            )
+            return
+        return await fn(self, interaction)
+    return wrapper
+
 
 class MovieSearchModal(Modal):
     """Modal para buscar películas por nombre."""
@@ -40,17 +79,32 @@ class MovieSearchModal(Modal):
     async def on_submit(self, interaction: discord.Interaction):
         """Procesa la búsqueda cuando se envía el modal."""
         search_term = self.search_input.value.strip()
-        logger.debug(f"Búsqueda de película: '{search_term}'")
-        
-        # Buscar coincidencias
-        matches = self.setup_view.doc_reader.find_movie_by_title(
-            search_term, 
-            pending_only=True
-        )
+        logger.debug("Búsqueda de película: '%s'", search_term)
+
+        # Buscar coincidencias (reutilizando búsquedas recientes idénticas,
+        # muy comunes cuando el usuario reintenta tras un error de tipeo)
+        cache_key = (search_term.lower(), True)
+        cached = self.setup_view._search_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < SEARCH_CACHE_TTL:
+            matches = cached[1]
+        else:
+            # Primero intentar el índice local de trigramas sobre el
+            # snapshot de pendientes: sin round-trip a Docs
+            await self.setup_view._ensure_search_index()
+            matches = self.setup_view._local_matches(search_term.lower())
+
+            if not matches:
+                # Sin coincidencias por substring: recurrir a la búsqueda
+                # difusa del lector (hilo aparte, concurrencia acotada)
+                matches = await gated_call(
+                    self.setup_view.doc_reader.find_movie_by_title,
+                    search_term,
+                    pending_only=True
+                )
+            self.setup_view._search_cache[cache_key] = (time.monotonic(), matches)
         
         # Filtrar películas ya seleccionadas
-        already_selected_titles = {m.titulo.lower() for m in self.setup_view.selected_movies}
-        matches = [m for m in matches if m.titulo.lower() not in already_selected_titles]
+        matches = [m for m in matches if m.titulo_lower not in self.setup_view._selected_lc]
         
         if not matches:
             await interaction.response.send_message(
@@ -64,7 +118,8 @@ class MovieSearchModal(Modal):
             # Una sola coincidencia - añadir directamente
             movie = matches[0]
             self.setup_view.selected_movies.append(movie)
-            logger.debug(f"Película añadida directamente: '{movie.titulo}'")
+            self.setup_view._selected_lc.add(movie.titulo_lower)
+            logger.debug("Película añadida directamente: '%s'", movie.titulo)
             
             await interaction.response.send_message(
                 f"✅ **{movie.titulo}** añadida a la votación.",
@@ -75,7 +130,7 @@ class MovieSearchModal(Modal):
             await self.setup_view.update_setup_message()
         else:
             # Múltiples coincidencias - mostrar selector
-            logger.debug(f"Múltiples coincidencias ({len(matches)}), mostrando selector")
+            logger.debug("Múltiples coincidencias (%d), mostrando selector", len(matches))
             
             view = MovieDisambiguationView(
                 matches=matches[:25],  # Límite de Discord
@@ -95,8 +150,10 @@ class MovieSearchModal(Modal):
             )
 
 
-class MovieDisambiguationView(View):
+class MovieDisambiguationView(TimeoutDisableMixin, View):
     """Vista con selector para elegir entre múltiples películas."""
+
+    __slots__ = ("matches", "setup_view", "_by_id", "select_menu")
     
     def __init__(
         self,
@@ -107,15 +164,19 @@ class MovieDisambiguationView(View):
         super().__init__(timeout=timeout)
         self.matches = matches
         self.setup_view = setup_view
-        
+
+        # Mapear cada opción a su película con un id estable: el lookup es
+        # O(1) y no depende del orden ni del recorte a 25 opciones
+        self._by_id = {uuid.uuid4().hex: movie for movie in matches[:25]}
+
         # Crear opciones del selector
         options = [
             discord.SelectOption(
                 label=movie.titulo[:100],
                 description=f"Por: {movie.proponente}"[:100],
-                value=str(i)
+                value=option_id
             )
-            for i, movie in enumerate(matches[:25])
+            for option_id, movie in self._by_id.items()
         ]
         
         self.select_menu = Select(
@@ -129,12 +190,12 @@ class MovieDisambiguationView(View):
     
     async def select_callback(self, interaction: discord.Interaction):
         """Callback cuando se selecciona una película."""
-        selected_index = int(self.select_menu.values[0])
-        movie = self.matches[selected_index]
+        movie = self._by_id[self.select_menu.values[0]]
         
         # Añadir a la lista
         self.setup_view.selected_movies.append(movie)
-        logger.debug(f"Película añadida desde selector: '{movie.titulo}'")
+        self.setup_view._selected_lc.add(movie.titulo_lower)
+        logger.debug("Película añadida desde selector: '%s'", movie.titulo)
         
         await interaction.response.edit_message(
             content=f"✅ **{movie.titulo}** añadida a la votación.",
@@ -144,14 +205,16 @@ class MovieDisambiguationView(View):
         
         # Actualizar el mensaje principal
         await self.setup_view.update_setup_message()
-    
-    async def on_timeout(self):
-        """Deshabilitar cuando expira."""
-        self.select_menu.disabled = True
 
 
 class VotingSetupView(View):
     """Vista principal para configurar una votación manual."""
+
+    __slots__ = (
+        "doc_reader", "cog", "creator", "duration_minutes",
+        "max_votes_per_user", "selected_movies", "_selected_lc", "message",
+        "channel_id", "_search_cache", "_pending_snapshot", "_trigram",
+    )
     
     def __init__(
         self,
@@ -169,11 +232,60 @@ class VotingSetupView(View):
         self.duration_minutes = duration_minutes
         self.max_votes_per_user = max_votes_per_user
         self.selected_movies: List[Movie] = []
+        # Títulos en minúsculas de las seleccionadas, mantenido
+        # incrementalmente para filtrar búsquedas en O(1) por match
+        self._selected_lc: set = set()
         self.message: Optional[discord.Message] = None
         self.channel_id: Optional[int] = None
+        # Caché de búsquedas: {(término, pending_only): (timestamp, matches)}
+        self._search_cache: dict = {}
+        # Snapshot de pendientes + índice de trigramas para buscar en local
+        self._pending_snapshot: Optional[List[Movie]] = None
+        self._trigram: Optional[dict] = None
         
         self._update_buttons()
-    
+
+    async def _ensure_search_index(self):
+        """
+        Construye (una sola vez por vista) el snapshot de películas
+        pendientes y su índice de trigramas para búsquedas locales.
+        """
+        if self._pending_snapshot is not None:
+            return
+
+        self._pending_snapshot = await gated_call(self.doc_reader.get_pending_movies)
+        self._trigram = defaultdict(set)
+        for idx, movie in enumerate(self._pending_snapshot):
+            titulo = movie.titulo_lower
+            for i in range(len(titulo) - 2):
+                self._trigram[titulo[i:i + 3]].add(idx)
+
+    def _local_matches(self, term_lc: str) -> List[Movie]:
+        """
+        Busca por substring contra el snapshot local.
+
+        Con términos de 3+ caracteres interseca los conjuntos de trigramas
+        para reducir candidatos; con términos más cortos recorre linealmente.
+        """
+        snapshot = self._pending_snapshot
+        if len(term_lc) < 3:
+            return [m for m in snapshot if term_lc in m.titulo_lower]
+
+        candidates = None
+        for i in range(len(term_lc) - 2):
+            ids = self._trigram.get(term_lc[i:i + 3])
+            if not ids:
+                return []
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+
+        return [
+            snapshot[idx]
+            for idx in sorted(candidates)
+            if term_lc in snapshot[idx].titulo_lower
+        ]
+
     def _update_buttons(self):
         """Actualiza el estado de los botones según las películas seleccionadas."""
         self.clear_items()
@@ -272,33 +384,21 @@ class VotingSetupView(View):
             except discord.NotFound:
                 logger.warning("Mensaje de configuración no encontrado")
             except Exception as e:
-                logger.error(f"Error al actualizar mensaje de configuración: {e}")
+                logger.error("Error al actualizar mensaje de configuración: %s", e)
     
+    @_creator_only
     async def add_movie_callback(self, interaction: discord.Interaction):
         """Callback para agregar película."""
-        # Verificar que sea el creador
-        if interaction.user.id != self.creator.id:
-            await interaction.response.send_message(
-                "❌ Solo el creador de la votación puede configurarla.",
-                ephemeral=True
-            )
-            return
-        
         # Abrir modal de búsqueda
         await interaction.response.send_modal(MovieSearchModal(self))
     
+    @_creator_only
     async def remove_last_callback(self, interaction: discord.Interaction):
         """Callback para quitar la última película."""
-        if interaction.user.id != self.creator.id:
-            await interaction.response.send_message(
-                "❌ Solo el creador de la votación puede configurarla.",
-                ephemeral=True
-            )
-            return
-        
         if self.selected_movies:
             removed = self.selected_movies.pop()
-            logger.debug(f"Película removida: '{removed.titulo}'")
+            self._selected_lc.discard(removed.titulo_lower)
+            logger.debug("Película removida: '%s'", removed.titulo)
             
             await interaction.response.send_message(
                 f"↩️ **{removed.titulo}** removida de la lista.",
@@ -311,15 +411,9 @@ class VotingSetupView(View):
                 ephemeral=True
             )
     
+    @_creator_only
     async def start_voting_callback(self, interaction: discord.Interaction):
         """Callback para iniciar la votación."""
-        if interaction.user.id != self.creator.id:
-            await interaction.response.send_message(
-                "❌ Solo el creador de la votación puede iniciarla.",
-                ephemeral=True
-            )
-            return
-        
         if len(self.selected_movies) < MIN_MOVIES_IN_VOTING:
             await interaction.response.send_message(
                 f"❌ Necesitas al menos {MIN_MOVIES_IN_VOTING} películas.",
@@ -327,7 +421,7 @@ class VotingSetupView(View):
             )
             return
         
-        logger.debug(f"Iniciando votación manual con {len(self.selected_movies)} películas")
+        logger.debug("Iniciando votación manual con %d películas", len(self.selected_movies))
         
         # Llamar al cog para iniciar la votación
         await self.cog.start_manual_voting(
@@ -341,24 +435,12 @@ class VotingSetupView(View):
         # Detener esta vista
         self.stop()
     
+    @_creator_only
     async def cancel_callback(self, interaction: discord.Interaction):
         """Callback para cancelar la configuración."""
-        if interaction.user.id != self.creator.id:
-            await interaction.response.send_message(
-                "❌ Solo el creador puede cancelar.",
-                ephemeral=True
-            )
-            return
-        
         logger.debug("Configuración de votación manual cancelada")
-        
-        embed = discord.Embed(
-            title="❌ Configuración cancelada",
-            description="La votación manual ha sido cancelada.",
-            color=discord.Color.greyple()
-        )
-        
-        await interaction.response.edit_message(embed=embed, view=None)
+
+        await interaction.response.edit_message(embed=_CANCELLED_EMBED.copy(), view=None)
         self.stop()
     
     async def on_timeout(self):
@@ -367,11 +449,6 @@ class VotingSetupView(View):
         
         if self.message:
             try:
-                embed = discord.Embed(
-                    title="⏰ Tiempo agotado",
-                    description="La configuración de la votación ha expirado.",
-                    color=discord.Color.greyple()
-                )
-                await self.message.edit(embed=embed, view=None)
+                await self.message.edit(embed=_TIMEOUT_EMBED.copy(), view=None)
             except:
                 pass
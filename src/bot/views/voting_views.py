@@ -14,97 +14,116 @@ if TYPE_CHECKING:
 
 logger = BotLogger(__name__)
 
+# Paleta de colores de los botones de voto (se repite cíclicamente).
+# Solo hay 3 estilos distintos, así que con 3 entradas alcanza
+_BUTTON_STYLES = (
+    discord.ButtonStyle.primary,
+    discord.ButtonStyle.success,
+    discord.ButtonStyle.secondary,
+)
+
 
 class VotingView(View):
     """Vista con botones para votar por películas."""
-    
+
+    __slots__ = ("session", "cog")
+
     def __init__(self, session: "VotingSession", cog: "VotingCog"):
         super().__init__(timeout=None)  # Sin timeout, controlado por la sesión
         self.session = session
         self.cog = cog
-        
+
         # Crear botones para cada película
-        for i, movie in enumerate(session.movies):
+        for i in range(len(session.movies)):
             button = VoteButton(
                 movie_index=i,
-                movie_title=movie.titulo,
-                session=session,
-                cog=cog
+                channel_id=session.channel_id
             )
             self.add_item(button)
 
 
-class VoteButton(Button):
-    """Botón individual para votar por una película."""
-    
-    def __init__(
-        self,
-        movie_index: int,
-        movie_title: str,
-        session: "VotingSession",
-        cog: "VotingCog"
-    ):
-        # Colores diferentes para cada botón
-        styles = [
-            discord.ButtonStyle.primary,
-            discord.ButtonStyle.success,
-            discord.ButtonStyle.secondary,
-            discord.ButtonStyle.primary,
-            discord.ButtonStyle.success,
-        ]
-        
+class VoteButton(
+    discord.ui.DynamicItem[Button],
+    template=r'vote:(?P<channel>\d+):(?P<idx>\d+)'
+):
+    """
+    Botón individual para votar por una película.
+
+    Es un DynamicItem: el custom_id codifica canal e índice, y discord.py
+    lo reconstruye desde el custom_id cuando llega una interacción sin
+    vista viva (por ejemplo tras un reinicio del proceso). La sesión se
+    resuelve en cada interacción desde el cog, no se retiene en el botón.
+    """
+
+    __slots__ = ("movie_index", "channel_id")
+
+    def __init__(self, movie_index: int, channel_id: int):
         super().__init__(
-            label=f"{movie_index + 1}",
-            style=styles[movie_index % len(styles)],
-            custom_id=f"vote_{session.channel_id}_{movie_index}"
+            Button(
+                label=f"{movie_index + 1}",
+                style=_BUTTON_STYLES[movie_index % 3],
+                custom_id=f"vote:{channel_id}:{movie_index}"
+            )
         )
         self.movie_index = movie_index
-        self.movie_title = movie_title
-        self.session = session
-        self.cog = cog
-    
+        self.channel_id = channel_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match):
+        """Reconstruye el botón a partir del custom_id."""
+        return cls(
+            movie_index=int(match['idx']),
+            channel_id=int(match['channel'])
+        )
+
+    def _resolve_session(self, interaction: discord.Interaction):
+        """Busca la sesión activa de este canal en el cog de votación."""
+        cog = interaction.client.get_cog("VotingCog")
+        if cog is None:
+            return None, None
+        return cog, cog.active_sessions.get(self.channel_id)
+
     async def callback(self, interaction: discord.Interaction):
         """Callback cuando se hace clic en el botón de voto."""
-        if not self.session.is_active:
-            await interaction.response.send_message(
+        # ACK inmediato: el registro del voto y la edición del mensaje
+        # pueden tardar más que la ventana de 3 s de Discord
+        await interaction.response.defer(ephemeral=True, thinking=False)
+
+        cog, session = self._resolve_session(interaction)
+        if (session is None or not session.is_active
+                or self.movie_index >= len(session.movies)):
+            await interaction.followup.send(
                 "❌ Esta votación ya ha terminado.",
                 ephemeral=True
             )
             return
-        
+
         user_id = interaction.user.id
         guild_name = interaction.guild.name if interaction.guild else "DM"
-        
-        # Verificar si ya votó por esta película (toggle)
-        if user_id in self.session.votes[self.movie_index]:
-            success, message = self.session.remove_vote(user_id, self.movie_index)
-            if success:
-                logger.vote(
-                    movie_title=self.movie_title,
-                    user=str(interaction.user),
-                    guild=guild_name,
-                    removed=True
-                )
-        else:
-            success, message = self.session.add_vote(user_id, self.movie_index)
-            if success:
-                logger.vote(
-                    movie_title=self.movie_title,
-                    user=str(interaction.user),
-                    guild=guild_name,
-                    removed=False
-                )
-        
+        movie_title = session.movies[self.movie_index].titulo
+
+        # Alternar el voto en una sola operación (sin doble lookup)
+        success, message, removed = session.toggle_vote(user_id, self.movie_index)
+        if success:
+            logger.vote(
+                movie_title=movie_title,
+                user=str(interaction.user),
+                guild=guild_name,
+                removed=removed
+            )
+
         # Mostrar mensaje efímero
-        await interaction.response.send_message(message, ephemeral=True)
-        
+        await interaction.followup.send(message, ephemeral=True)
+
         # Actualizar el mensaje de votación si el voto fue exitoso
         if success:
-            await self.cog.update_voting_message(self.session)
+            cog.schedule_update(session)
 
 
 class TieBreakView(View):
     """Vista para manejar empates en votaciones."""
+
+    __slots__ = ("tied_movies", "cog", "original_session", "doc_reader")
     
     def __init__(
         self,
@@ -164,7 +183,10 @@ class TieBreakView(View):
     async def new_voting(self, interaction: discord.Interaction, button: Button):
         """Inicia una nueva votación solo con los empatados."""
         from src.bot.cogs.voting import VotingSession
-        
+
+        # ACK primero: armar la sesión y editar mensajes toma su tiempo
+        await interaction.response.defer()
+
         logger.action(
             "TIE_BREAK_REVOTE",
             user=str(interaction.user),
@@ -202,22 +224,23 @@ class TieBreakView(View):
         
         embed.set_footer(text="Los votos se actualizan en tiempo real")
         
-        # Crear vista con botones
+        # Crear vista con botones (una sola vez por sesión)
         view = VotingView(new_session, self.cog)
+        new_session.view = view
         
         # Deshabilitar botones actuales
         self.disable_all_items()
         await interaction.message.edit(view=self)
-        
-        message = await interaction.response.send_message(embed=embed, view=view)
-        
-        # Obtener el mensaje enviado
-        new_session.message = await interaction.original_response()
-        
-        # Programar fin de votación
-        import asyncio
-        self.cog.bot.loop.create_task(
-            self.cog._end_voting_after(new_session, 3 * 60)
+
+        # wait=True devuelve el Message directamente, sin el GET extra
+        # de original_response()
+        new_session.message = await interaction.followup.send(
+            embed=embed, view=view, wait=True
+        )
+
+        # Programar fin de votación (timer cancelable)
+        new_session._timer = self.cog.bot.loop.call_later(
+            3 * 60, self.cog._on_voting_expired, new_session
         )
     
     def disable_all_items(self):
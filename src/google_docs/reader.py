@@ -1,27 +1,86 @@
 """
 Lector y escritor de documentos de Google Docs.
 """
+import asyncio
+import random
 import re
+import threading
+import time
 from typing import List, Optional, Tuple
+import orjson
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
 
 from src.models import Movie
 import config
 
 
+class _OrjsonModel(JsonModel):
+    """
+    Modelo de respuesta que decodifica el JSON con orjson (parser en C).
+
+    Para documentos grandes, el decode del JSON domina el tiempo de
+    fetch_content; orjson lo reduce varias veces frente al json puro
+    de googleapiclient.
+    """
+
+    def deserialize(self, content):
+        body = orjson.loads(content)
+        if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+            body = body['data']
+        return body
+
+
 class MovieDocReader:
     """
     Clase para leer y modificar el documento de películas en Google Docs.
     """
     
     SCOPES = ['https://www.googleapis.com/auth/documents']
-    
-    def __init__(self, credentials_path: str = None, document_id: str = None):
+
+    # Máscara de campos: pedir solo lo que el parser realmente lee
+    # (el documento completo trae estilos, sugerencias, headers, etc.
+    # que multiplican varias veces el tamaño del JSON)
+    FIELDS_MASK = (
+        'title,'
+        'revisionId,'
+        'body(content(sectionBreak,paragraph(elements('
+        'startIndex,endIndex,pageBreak,'
+        'textRun(content,textStyle/strikethrough)))))'
+    )
+
+    # Tiempo (segundos) durante el cual se reutiliza la lista de películas
+    CACHE_TTL = 30.0
+
+    def __init__(
+        self,
+        credentials_path: str = None,
+        document_id: str = None,
+        cache_ttl: float = None
+    ):
         self.credentials_path = credentials_path or config.GOOGLE_CREDENTIALS_PATH
         self.document_id = document_id or config.GOOGLE_DOC_ID
         self.service = None
+        self._cache_ttl = cache_ttl if cache_ttl is not None else self.CACHE_TTL
+        self._cached_movies: Optional[List[Movie]] = None
+        self._cached_at: float = 0.0
+        # Delimitadores precompilados: igualdad vía set (O(1)) y substring
+        # vía una sola regex alternada (un escaneo en C por línea)
+        self._delim_set = frozenset(config.PAGE_DELIMITERS)
+        self._delim_re = re.compile(
+            '|'.join(map(re.escape, config.PAGE_DELIMITERS))
+        )
+        # Línea "Título - Proponente" en una sola pasada: el título
+        # codicioso reproduce la semántica de rsplit (último separador)
+        self._line_re = re.compile(
+            rf'(?P<title>.+){re.escape(config.MOVIE_SEPARATOR)}(?P<prop>.+)'
+        )
+        # El transporte httplib2/AuthorizedHttp NO es thread-safe y este
+        # lector se usa desde varios hilos (asyncio.to_thread): todas las
+        # llamadas HTTP van serializadas por este lock
+        self._http_lock = threading.Lock()
         self._connect()
     
     def _connect(self):
@@ -31,7 +90,18 @@ class MovieDocReader:
                 self.credentials_path,
                 scopes=self.SCOPES
             )
-            self.service = build('docs', 'v1', credentials=credentials)
+            # static_discovery: usar el documento de descubrimiento
+            # empaquetado en la librería en vez de descargarlo en cada
+            # arranque. El transporte (AuthorizedHttp) es uno solo por
+            # instancia —la conexión TLS se reutiliza— pero solo bajo uso
+            # serializado: ver _http_lock
+            self.service = build(
+                'docs', 'v1',
+                credentials=credentials,
+                model=_OrjsonModel(),
+                cache_discovery=False,
+                static_discovery=True
+            )
         except Exception as e:
             raise ConnectionError(f"Error al conectar con Google Docs: {e}")
     
@@ -40,48 +110,74 @@ class MovieDocReader:
         Obtiene el contenido completo del documento en formato JSON.
         """
         try:
-            document = self.service.documents().get(documentId=self.document_id).execute()
+            with self._http_lock:
+                document = self.service.documents().get(
+                    documentId=self.document_id,
+                    fields=self.FIELDS_MASK
+                ).execute()
             return document
         except HttpError as e:
             raise Exception(f"Error al obtener el documento: {e}")
     
+    def iter_content(self):
+        """
+        Itera perezosamente los elementos estructurales del cuerpo del
+        documento.
+
+        Permite a los consumidores cortar temprano (p. ej. al encontrar
+        un delimitador) sin materializar copias intermedias de la lista.
+        """
+        yield from self.fetch_content().get('body', {}).get('content', ())
+
     def _find_delimiter_index(self, content: List[dict]) -> Optional[int]:
         """
         Encuentra el índice donde comienza el contenido a ignorar (última página).
         Busca delimitadores como '-----' o saltos de página.
         Retorna el índice del elemento donde se debe cortar.
+
+        Recorre el contenido de atrás hacia adelante: el delimitador vive
+        por definición cerca del final del documento, así que el escaneo
+        inverso examina muchos menos elementos en el caso típico.
         """
         last_page_break_index = None
-        
-        for i, element in enumerate(content):
-            # Detectar sectionBreak (salto de sección/página)
+
+        for i in range(len(content) - 1, -1, -1):
+            element = content[i]
+
+            # Detectar sectionBreak (salto de sección/página). Al ir en
+            # reversa, el primero que aparece es el último del documento
             if 'sectionBreak' in element:
-                last_page_break_index = i
+                if last_page_break_index is None:
+                    last_page_break_index = i
                 continue
-            
+
             if 'paragraph' in element:
                 paragraph = element['paragraph']
-                
+
                 # Detectar pageBreak dentro de un párrafo
-                for elem in paragraph.get('elements', []):
-                    if 'pageBreak' in elem:
-                        last_page_break_index = i
-                        break
-                
-                # Buscar delimitadores de texto como '-----'
-                for elem in paragraph.get('elements', []):
-                    if 'textRun' in elem:
-                        text = elem['textRun'].get('content', '').strip()
-                        # Verificar si el texto contiene un delimitador
-                        for delimiter in config.PAGE_DELIMITERS:
-                            if text == delimiter or delimiter in text:
-                                # Encontramos un delimitador visual
-                                return i
-        
+                if last_page_break_index is None:
+                    for elem in paragraph.get('elements', []):
+                        if 'pageBreak' in elem:
+                            last_page_break_index = i
+                            break
+
+                # Buscar delimitadores de texto como '-----': una sola
+                # pasada de la regex sobre el texto concatenado del
+                # párrafo, no una por textRun
+                text = ''.join(
+                    elem['textRun'].get('content', '')
+                    for elem in paragraph.get('elements', [])
+                    if 'textRun' in elem
+                ).strip()
+                if text and (text in self._delim_set
+                             or self._delim_re.search(text)):
+                    # Encontramos un delimitador visual
+                    return i
+
         # Si hay un salto de página/sección, usar ese como punto de corte
         if last_page_break_index is not None:
             return last_page_break_index
-        
+
         return None
     
     def _parse_movie_line(self, text: str, is_strikethrough: bool, 
@@ -91,23 +187,19 @@ class MovieDocReader:
         Formato esperado: "Título - Proponente"
         """
         text = text.strip()
-        if not text or text in config.PAGE_DELIMITERS:
+        if not text or text in self._delim_set:
             return None
-        
-        # Intentar separar título y proponente
-        separator = config.MOVIE_SEPARATOR
-        if separator in text:
-            parts = text.rsplit(separator, 1)
-            if len(parts) == 2:
-                titulo = parts[0].strip()
-                proponente = parts[1].strip()
-            else:
-                titulo = text
-                proponente = "Desconocido"
+
+        # Separar título y proponente con la regex precompilada
+        # (una sola pasada en C sobre la línea)
+        match = self._line_re.fullmatch(text)
+        if match:
+            titulo = match['title'].strip()
+            proponente = match['prop'].strip()
         else:
             titulo = text
             proponente = "Desconocido"
-        
+
         if not titulo:
             return None
         
@@ -123,58 +215,107 @@ class MovieDocReader:
         """
         Obtiene la lista de películas del documento.
         Detecta cuáles están tachadas (vistas) y cuáles no.
+
+        El resultado se cachea durante CACHE_TTL segundos para que
+        comandos consecutivos no repitan el round-trip a Google Docs.
+        """
+        if (self._cached_movies is not None
+                and time.monotonic() - self._cached_at < self._cache_ttl):
+            return self._cached_movies
+
+        try:
+            movies = self._fetch_movies()
+        except Exception:
+            # Si la recarga falla pero hay datos viejos, servirlos
+            if self._cached_movies is not None:
+                return self._cached_movies
+            raise
+
+        self._cached_movies = movies
+        self._cached_at = time.monotonic()
+        return movies
+
+    def invalidate(self):
+        """Descarta la lista cacheada; la próxima lectura irá al documento."""
+        self._cached_movies = None
+        self._cached_at = 0.0
+
+    def _fetch_movies(self) -> List[Movie]:
+        """
+        Descarga y parsea la lista de películas (sin caché).
+
+        La detección de delimitadores va fusionada en la misma pasada que
+        el parseo: cada párrafo se recorre una sola vez, y al encontrar
+        un delimitador de texto el iterador se abandona sin recorrer el
+        resto del documento.
         """
-        document = self.fetch_content()
-        content = document.get('body', {}).get('content', [])
-        
-        # Encontrar dónde termina el contenido relevante
-        delimiter_index = self._find_delimiter_index(content)
-        if delimiter_index:
-            content = content[:delimiter_index]
-        
         movies = []
-        
-        for element in content:
+        # Películas parseadas hasta el último salto de página/sección:
+        # si no aparece un delimitador de texto, se corta ahí
+        break_marker = None
+
+        for element in self.iter_content():
+            # Detectar sectionBreak (salto de sección/página)
+            if 'sectionBreak' in element:
+                break_marker = len(movies)
+                continue
+
             if 'paragraph' not in element:
                 continue
-            
-            paragraph = element['paragraph']
-            paragraph_text = ""
+
+            elements = element['paragraph'].get('elements', ())
+            paragraph_parts = []
             is_strikethrough = False
             start_index = None
             end_index = None
-            
-            for elem in paragraph.get('elements', []):
+            has_page_break = False
+
+            for elem in elements:
+                # Detectar pageBreak dentro del párrafo
+                if 'pageBreak' in elem:
+                    has_page_break = True
+
                 if 'textRun' not in elem:
                     continue
-                
+
                 text_run = elem['textRun']
                 text = text_run.get('content', '')
-                text_style = text_run.get('textStyle', {})
-                
+
                 # Verificar si tiene tachado
-                if text_style.get('strikethrough', False):
+                if text_run.get('textStyle', {}).get('strikethrough', False):
                     is_strikethrough = True
-                
+
                 # Guardar índices para poder tachar después
                 if start_index is None:
                     start_index = elem.get('startIndex', 0)
                 end_index = elem.get('endIndex', 0)
-                
-                paragraph_text += text
-            
-            # Limpiar y parsear
-            paragraph_text = paragraph_text.strip()
-            if paragraph_text and paragraph_text not in ['\n', '']:
+
+                paragraph_parts.append(text)
+
+            if has_page_break:
+                break_marker = len(movies)
+
+            # Limpiar y parsear. El delimitador se busca una sola vez
+            # sobre el texto completo del párrafo (no por textRun)
+            paragraph_text = ''.join(paragraph_parts).strip()
+            if paragraph_text:
+                if (paragraph_text in self._delim_set
+                        or self._delim_re.search(paragraph_text)):
+                    # Delimitador de texto como '-----': lo anterior es la lista
+                    return movies
                 movie = self._parse_movie_line(
-                    paragraph_text, 
-                    is_strikethrough, 
-                    start_index, 
+                    paragraph_text,
+                    is_strikethrough,
+                    start_index,
                     end_index
                 )
                 if movie:
                     movies.append(movie)
-        
+
+        # Sin delimitador de texto: cortar en el último salto de página
+        if break_marker is not None:
+            del movies[break_marker:]
+
         return movies
     
     def get_pending_movies(self) -> List[Movie]:
@@ -193,9 +334,39 @@ class MovieDocReader:
         proponent_lower = proponent.lower()
         return [
             m for m in self.get_movies() 
-            if proponent_lower in m.proponente.lower()
+            if proponent_lower in m.proponente_lower
         ]
     
+    def _iter_pending(self, proponent: str = None):
+        """Itera las películas pendientes, filtrando por proponente si aplica."""
+        proponent_lower = proponent.lower() if proponent else None
+        for movie in self.get_movies():
+            if not movie.is_pending:
+                continue
+            if proponent_lower and proponent_lower not in movie.proponente_lower:
+                continue
+            yield movie
+
+    def count_pending(self, proponent: str = None) -> int:
+        """Cuenta las películas pendientes sin materializar listas intermedias."""
+        return sum(1 for _ in self._iter_pending(proponent))
+
+    def pick_random_pending(self, proponent: str = None) -> Optional[Movie]:
+        """
+        Elige una película pendiente al azar (opcionalmente por proponente)
+        sin construir la lista filtrada completa.
+        """
+        count = self.count_pending(proponent)
+        if count == 0:
+            return None
+
+        target = random.randrange(count)
+        for movie in self._iter_pending(proponent):
+            if target == 0:
+                return movie
+            target -= 1
+        return None
+
     def strike_movie(self, movie: Movie) -> bool:
         """
         Aplica formato tachado a una película en el documento.
@@ -208,31 +379,62 @@ class MovieDocReader:
         """
         if movie.start_index is None or movie.end_index is None:
             raise ValueError("La película no tiene índices de posición válidos")
-        
-        try:
-            requests = [
-                {
-                    'updateTextStyle': {
-                        'range': {
-                            'startIndex': movie.start_index,
-                            'endIndex': movie.end_index
-                        },
-                        'textStyle': {
-                            'strikethrough': True
-                        },
-                        'fields': 'strikethrough'
-                    }
+
+        return self.strike_movies_batch([movie])
+
+    def strike_movies_batch(self, movies: List[Movie]) -> bool:
+        """
+        Aplica formato tachado a varias películas en un solo batchUpdate.
+
+        Un solo round-trip a la API en lugar de uno por película.
+
+        Args:
+            movies: Películas a tachar (todas con índices de posición)
+
+        Returns:
+            True si se tacharon correctamente
+        """
+        if not movies:
+            return True
+
+        for movie in movies:
+            if movie.start_index is None or movie.end_index is None:
+                raise ValueError(
+                    f"La película '{movie.titulo}' no tiene índices de posición válidos"
+                )
+
+        # De atrás hacia adelante: el tachado no mueve índices, pero así el
+        # lote también es válido si alguna vez incluye ediciones de texto
+        requests = [
+            {
+                'updateTextStyle': {
+                    'range': {
+                        'startIndex': movie.start_index,
+                        'endIndex': movie.end_index
+                    },
+                    'textStyle': {
+                        'strikethrough': True
+                    },
+                    'fields': 'strikethrough'
                 }
-            ]
-            
-            self.service.documents().batchUpdate(
-                documentId=self.document_id,
-                body={'requests': requests}
-            ).execute()
-            
+            }
+            for movie in sorted(movies, key=lambda m: m.start_index, reverse=True)
+        ]
+
+        try:
+            with self._http_lock:
+                self.service.documents().batchUpdate(
+                    documentId=self.document_id,
+                    body={'requests': requests}
+                ).execute()
+
+            # Reflejar el cambio en la caché sin re-descargar el documento
+            for movie in movies:
+                movie.mark_seen()
+
             return True
         except HttpError as e:
-            raise Exception(f"Error al tachar la película: {e}")
+            raise Exception(f"Error al tachar las películas: {e}")
     
     def find_movie_by_title(self, title: str, pending_only: bool = True) -> List[Movie]:
         """
@@ -245,21 +447,82 @@ class MovieDocReader:
         Returns:
             Lista de películas que coinciden
         """
-        from thefuzz import fuzz
-        
+        from rapidfuzz import fuzz, process
+
         movies = self.get_pending_movies() if pending_only else self.get_movies()
         title_lower = title.lower()
-        
+
+        # Coincidencias exactas y por substring primero (baratas, en C)
         matches = []
+        fuzzy_candidates = []
         for movie in movies:
-            # Coincidencia exacta
-            if title_lower == movie.titulo.lower():
+            if title_lower == movie.titulo_lower:
                 matches.insert(0, movie)
-            # Coincidencia parcial
-            elif title_lower in movie.titulo.lower():
+            elif title_lower in movie.titulo_lower:
                 matches.append(movie)
-            # Coincidencia difusa (fuzzy)
-            elif fuzz.ratio(title_lower, movie.titulo.lower()) > 70:
-                matches.append(movie)
-        
+            else:
+                fuzzy_candidates.append(movie)
+
+        # Coincidencia difusa en una sola llamada vectorizada sobre
+        # el resto de candidatos
+        if fuzzy_candidates:
+            results = process.extract(
+                title_lower,
+                [m.titulo_lower for m in fuzzy_candidates],
+                scorer=fuzz.ratio,
+                score_cutoff=70,
+                limit=None
+            )
+            matches.extend(fuzzy_candidates[idx] for _, _, idx in results)
+
         return matches
+
+    # ========================================
+    # Envoltorios async: las llamadas HTTPS son bloqueantes, así que al
+    # usarlas desde el event loop del bot van en un hilo aparte
+    # (asyncio.to_thread) para no congelar las demás interacciones
+    # ========================================
+
+    async def afetch_content(self) -> dict:
+        """Versión async de fetch_content (ejecuta en un hilo)."""
+        return await asyncio.to_thread(self.fetch_content)
+
+    async def aget_movies(self) -> List[Movie]:
+        """Versión async de get_movies (ejecuta en un hilo)."""
+        return await asyncio.to_thread(self.get_movies)
+
+    async def aget_pending_movies(self) -> List[Movie]:
+        """Versión async de get_pending_movies (ejecuta en un hilo)."""
+        return await asyncio.to_thread(self.get_pending_movies)
+
+    async def aget_seen_movies(self) -> List[Movie]:
+        """Versión async de get_seen_movies (ejecuta en un hilo)."""
+        return await asyncio.to_thread(self.get_seen_movies)
+
+    async def aget_movies_by_proponent(self, proponent: str) -> List[Movie]:
+        """Versión async de get_movies_by_proponent (ejecuta en un hilo)."""
+        return await asyncio.to_thread(self.get_movies_by_proponent, proponent)
+
+    async def acount_pending(self, proponent: str = None) -> int:
+        """Versión async de count_pending (ejecuta en un hilo)."""
+        return await asyncio.to_thread(self.count_pending, proponent)
+
+    async def apick_random_pending(self, proponent: str = None) -> Optional[Movie]:
+        """Versión async de pick_random_pending (ejecuta en un hilo)."""
+        return await asyncio.to_thread(self.pick_random_pending, proponent)
+
+    async def afind_movie_by_title(
+        self, title: str, pending_only: bool = True
+    ) -> List[Movie]:
+        """Versión async de find_movie_by_title (ejecuta en un hilo)."""
+        return await asyncio.to_thread(
+            self.find_movie_by_title, title, pending_only
+        )
+
+    async def astrike_movie(self, movie: Movie) -> bool:
+        """Versión async de strike_movie (ejecuta en un hilo)."""
+        return await asyncio.to_thread(self.strike_movie, movie)
+
+    async def astrike_movies_batch(self, movies: List[Movie]) -> bool:
+        """Versión async de strike_movies_batch (ejecuta en un hilo)."""
+        return await asyncio.to_thread(self.strike_movies_batch, movies)
@@ -1,24 +1,46 @@
 """
 Modelo de datos para una película.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Movie:
-    """Representa una película del documento."""
-    
+    """
+    Representa una película del documento.
+
+    Inmutable (frozen): las instancias se pueden usar como claves o en
+    sets, y nada fuera del lector puede alterarlas por accidente. El
+    único cambio de estado legítimo —tacharla— pasa por mark_seen().
+    """
+
     titulo: str
     proponente: str
-    seen: bool = False
+    # seen queda fuera de eq/hash: mark_seen() no debe cambiar el hash
+    # de una película que ya esté dentro de un set o dict
+    seen: bool = field(default=False, compare=False)
     start_index: Optional[int] = None
     end_index: Optional[int] = None
-    
-    @property
-    def is_pending(self) -> bool:
-        """Retorna True si la película está pendiente (no vista)."""
-        return not self.seen
+    # Versiones en minúsculas, calculadas una sola vez al crear la película
+    # (las búsquedas y filtros comparan contra estos campos; derivadas,
+    # no participan en eq/hash)
+    titulo_lower: str = field(init=False, repr=False, compare=False)
+    proponente_lower: str = field(init=False, repr=False, compare=False)
+    # Negación de seen, precalculada: los filtros la leen N veces y un
+    # atributo en slot es más barato que despachar una property
+    is_pending: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # object.__setattr__ porque la clase es frozen
+        object.__setattr__(self, 'titulo_lower', self.titulo.lower())
+        object.__setattr__(self, 'proponente_lower', self.proponente.lower())
+        object.__setattr__(self, 'is_pending', not self.seen)
+
+    def mark_seen(self):
+        """Marca la película como vista (solo para el lector al tachar)."""
+        object.__setattr__(self, 'seen', True)
+        object.__setattr__(self, 'is_pending', False)
     
     def __str__(self) -> str:
         status = "✅" if self.seen else "⏳"
@@ -1,11 +1,13 @@
 """
 Sistema de logging centralizado y detallado.
 """
+import atexit
 import logging
+import queue
 import sys
 from datetime import datetime
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 # Directorio de logs
 LOGS_DIR = Path(__file__).parent.parent.parent / "logs"
@@ -24,12 +26,9 @@ CONSOLE_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)-20s | %(message)s"
 ACTION_FORMAT = "%(asctime)s | %(levelname)-8s | %(message)s"
 
 
-class ActionFilter(logging.Filter):
-    """Filtro para el log de acciones importantes."""
-    
-    def filter(self, record):
-        # Solo pasar mensajes marcados como acciones
-        return getattr(record, 'action', False)
+# Logger dedicado para acciones del bot: solo el handler del archivo de
+# acciones lo escucha, sin filtros por registro en los demás handlers
+_action_logger = logging.getLogger('bot.actions')
 
 
 def setup_logging(level: int = logging.INFO) -> None:
@@ -52,30 +51,37 @@ def setup_logging(level: int = logging.INFO) -> None:
     # ========================================
     # Handler 1: Consola (INFO+)
     # ========================================
+    # Un solo Formatter detallado compartido por los handlers de archivo:
+    # los formatters no guardan estado por registro, no hace falta uno
+    # por handler
+    detailed_formatter = logging.Formatter(
+        DETAILED_FORMAT,
+        datefmt="%Y-%m-%d %H:%M:%S"
+    )
+
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
     console_handler.setFormatter(logging.Formatter(
         CONSOLE_FORMAT,
         datefmt="%Y-%m-%d %H:%M:%S"
     ))
-    root_logger.addHandler(console_handler)
     
     # ========================================
     # Handler 2: Archivo general detallado (DEBUG+)
     # ========================================
+    # delay=True en los handlers de archivo: el archivo se abre recién
+    # con el primer registro, así invocaciones cortas (tests, --help)
+    # no crean logs vacíos ni descriptores que no van a usar
     general_log_file = LOGS_DIR / f"bot_{date_str}.log"
     file_handler = RotatingFileHandler(
         general_log_file,
         maxBytes=10 * 1024 * 1024,  # 10 MB
         backupCount=5,
-        encoding='utf-8'
+        encoding='utf-8',
+        delay=True
     )
     file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(logging.Formatter(
-        DETAILED_FORMAT,
-        datefmt="%Y-%m-%d %H:%M:%S"
-    ))
-    root_logger.addHandler(file_handler)
+    file_handler.setFormatter(detailed_formatter)
     
     # ========================================
     # Handler 3: Archivo de errores (WARNING+)
@@ -85,14 +91,11 @@ def setup_logging(level: int = logging.INFO) -> None:
         error_log_file,
         maxBytes=5 * 1024 * 1024,  # 5 MB
         backupCount=3,
-        encoding='utf-8'
+        encoding='utf-8',
+        delay=True
     )
     error_handler.setLevel(logging.WARNING)
-    error_handler.setFormatter(logging.Formatter(
-        DETAILED_FORMAT,
-        datefmt="%Y-%m-%d %H:%M:%S"
-    ))
-    root_logger.addHandler(error_handler)
+    error_handler.setFormatter(detailed_formatter)
     
     # ========================================
     # Handler 4: Archivo de acciones (registro de uso)
@@ -102,16 +105,49 @@ def setup_logging(level: int = logging.INFO) -> None:
         actions_log_file,
         maxBytes=5 * 1024 * 1024,  # 5 MB
         backupCount=10,
-        encoding='utf-8'
+        encoding='utf-8',
+        delay=True
     )
     actions_handler.setLevel(logging.INFO)
     actions_handler.setFormatter(logging.Formatter(
         ACTION_FORMAT,
         datefmt="%Y-%m-%d %H:%M:%S"
     ))
-    actions_handler.addFilter(ActionFilter())
-    root_logger.addHandler(actions_handler)
-    
+
+    # ========================================
+    # Cola de logging: el hilo que loggea solo encola (µs); la escritura
+    # real a consola/archivos ocurre en un hilo del QueueListener, sin
+    # bloquear el event loop
+    # ========================================
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(QueueHandler(log_queue))
+
+    listener = QueueListener(
+        log_queue,
+        console_handler,
+        file_handler,
+        error_handler,
+        respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    # Las acciones van por su propio subárbol 'bot.actions': solo el
+    # handler de acciones las escucha (con su propia cola) y, por
+    # propagación, también llegan a consola/archivo general. Los demás
+    # registros del proceso ya no pasan por ningún filtro de acciones
+    actions_queue = queue.SimpleQueue()
+    _action_logger.handlers.clear()
+    _action_logger.addHandler(QueueHandler(actions_queue))
+
+    actions_listener = QueueListener(
+        actions_queue,
+        actions_handler,
+        respect_handler_level=True
+    )
+    actions_listener.start()
+    atexit.register(actions_listener.stop)
+
     # Reducir ruido de librerías externas
     logging.getLogger('discord').setLevel(logging.WARNING)
     logging.getLogger('discord.http').setLevel(logging.WARNING)
@@ -153,27 +189,31 @@ def log_action(
 ) -> None:
     """
     Registra una acción importante del bot.
-    
+
+    Las acciones se publican en el logger 'bot.actions', que alimenta
+    el archivo de acciones directamente (sin filtros por registro).
+
     Args:
-        logger: Logger a usar
+        logger: Logger del módulo que origina la acción (se conserva
+            por compatibilidad; el registro sale por 'bot.actions')
         action: Tipo de acción (ej: "COMMAND", "VOTE", "STRIKE")
         user: Usuario que realizó la acción
         guild: Servidor donde ocurrió
         details: Detalles adicionales
     """
-    parts = [f"[{action}]"]
-    
-    if guild:
-        parts.append(f"[Server: {guild}]")
-    if user:
-        parts.append(f"[User: {user}]")
-    if details:
-        parts.append(details)
-    
-    message = " ".join(parts)
-    
-    # Crear un registro con el atributo 'action' para el filtro
-    logger.info(message, extra={'action': True})
+    # Si el logger está filtrado a este nivel, no armar nada
+    if not _action_logger.isEnabledFor(logging.INFO):
+        return
+
+    guild_part = f" [Server: {guild}]" if guild else ""
+    user_part = f" [User: {user}]" if user else ""
+
+    # Formateo %s perezoso: el mensaje final se arma solo si algún
+    # handler acepta el registro
+    _action_logger.info(
+        "[%s]%s%s %s",
+        action, guild_part, user_part, details or ""
+    )
 
 
 class BotLogger:
@@ -184,25 +224,25 @@ class BotLogger:
     def __init__(self, name: str):
         self.logger = logging.getLogger(name)
     
-    def debug(self, message: str, **kwargs):
-        """Log de nivel DEBUG."""
-        self.logger.debug(message, **kwargs)
-    
-    def info(self, message: str, **kwargs):
-        """Log de nivel INFO."""
-        self.logger.info(message, **kwargs)
-    
-    def warning(self, message: str, **kwargs):
-        """Log de nivel WARNING."""
-        self.logger.warning(message, **kwargs)
-    
-    def error(self, message: str, exc_info: bool = False, **kwargs):
-        """Log de nivel ERROR."""
-        self.logger.error(message, exc_info=exc_info, **kwargs)
-    
-    def critical(self, message: str, exc_info: bool = True, **kwargs):
-        """Log de nivel CRITICAL."""
-        self.logger.critical(message, exc_info=exc_info, **kwargs)
+    def debug(self, message: str, *args, **kwargs):
+        """Log de nivel DEBUG (formateo %s perezoso)."""
+        self.logger.debug(message, *args, **kwargs)
+
+    def info(self, message: str, *args, **kwargs):
+        """Log de nivel INFO (formateo %s perezoso)."""
+        self.logger.info(message, *args, **kwargs)
+
+    def warning(self, message: str, *args, **kwargs):
+        """Log de nivel WARNING (formateo %s perezoso)."""
+        self.logger.warning(message, *args, **kwargs)
+
+    def error(self, message: str, *args, exc_info: bool = False, **kwargs):
+        """Log de nivel ERROR (formateo %s perezoso)."""
+        self.logger.error(message, *args, exc_info=exc_info, **kwargs)
+
+    def critical(self, message: str, *args, exc_info: bool = True, **kwargs):
+        """Log de nivel CRITICAL (formateo %s perezoso)."""
+        self.logger.critical(message, *args, exc_info=exc_info, **kwargs)
     
     def action(
         self,
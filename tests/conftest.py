@@ -0,0 +1,46 @@
+"""
+Fixtures de pytest para los tests del lector.
+
+Con esto la suite también se puede correr como `pytest tests/` (y en
+paralelo con pytest-xdist): las fixtures de sesión garantizan una sola
+conexión, una descarga y un parseo por run, igual que el main() manual.
+"""
+import sys
+import os
+
+import pytest
+
+# Añadir el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Sin las librerías de Google instaladas no hay nada que probar
+pytest.importorskip('googleapiclient')
+
+from src.google_docs import MovieDocReader
+
+
+@pytest.fixture(scope='session')
+def reader():
+    """Un único MovieDocReader compartido por toda la sesión."""
+    try:
+        return MovieDocReader()
+    except ConnectionError as e:
+        pytest.skip(f"Sin conexión con Google Docs: {e}")
+
+
+@pytest.fixture(scope='session')
+def document(reader):
+    """El documento descargado una sola vez por sesión."""
+    return reader.fetch_content()
+
+
+@pytest.fixture(scope='session')
+def movies(reader):
+    """La lista de películas parseada una sola vez por sesión."""
+    return reader.get_movies()
+
+
+@pytest.fixture(scope='session')
+def proponents(movies):
+    """Proponentes únicos en orden de aparición."""
+    return dict.fromkeys(m.proponente for m in movies).keys()
@@ -1,89 +1,174 @@
 """
 Script de prueba para verificar la lectura del documento de Google Docs.
-Ejecutar: python -m tests.test_reader
+Ejecutar: python -m tests.test_reader [--cache] [--ndjson]
+
+Con --cache, la lista parseada se guarda en disco keyed por el
+revisionId del documento: si el doc no cambió, el run siguiente solo
+hace la consulta de metadatos (~5KB) en vez de descargar y parsear todo.
+
+Con --ndjson, en lugar de la salida humana se emite un evento JSON por
+línea (apto para jq o un colector de CI, sin regex sobre texto libre).
 """
+import functools
+import pickle
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import orjson
 
 # Añadir el directorio raíz al path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.google_docs import MovieDocReader
 
+# Modo de salida estructurada (ver docstring)
+_NDJSON = '--ndjson' in sys.argv
+
+
+def _emit(event: str, **fields):
+    """Emite un evento ndjson (solo en modo --ndjson)."""
+    if _NDJSON:
+        fields['event'] = event
+        sys.stdout.write(orjson.dumps(fields).decode() + '\n')
+
+
+def _flush(out):
+    """Escribe la salida humana acumulada (omitida en modo --ndjson)."""
+    if not _NDJSON:
+        sys.stdout.write("\n".join(out) + "\n")
+
+
+# Caché en disco de la lista parseada (ver flag --cache)
+CACHE_DIR = Path.home() / '.cache' / 'pelis-bot'
+
+# Separador de cabeceras, construido una sola vez
+_HDR = "=" * 50
+
+
+def _header(title: str) -> str:
+    """Cabecera de tres líneas para la salida de cada test."""
+    return f"{_HDR}\nTEST: {title}\n{_HDR}"
+
 
 def test_connection():
     """Prueba la conexión con Google Docs."""
-    print("=" * 50)
-    print("TEST: Conexión con Google Docs")
-    print("=" * 50)
-    
+    out = [_header("Conexión con Google Docs")]
+
     try:
         reader = MovieDocReader()
-        print("✅ Conexión exitosa")
+        out.append("✅ Conexión exitosa")
+        _emit('connection_ok')
         return reader
     except Exception as e:
-        print(f"❌ Error de conexión: {e}")
+        out.append(f"❌ Error de conexión: {e}")
+        _emit('error', stage='connection', message=str(e))
         return None
+    finally:
+        _flush(out)
 
 
 def test_fetch_content(reader: MovieDocReader):
     """Prueba la obtención del contenido del documento."""
-    print("\n" + "=" * 50)
-    print("TEST: Obtener contenido del documento")
-    print("=" * 50)
-    
+    out = ["\n" + _header("Obtener contenido del documento")]
+
     try:
         content = reader.fetch_content()
         title = content.get('title', 'Sin título')
-        print(f"✅ Documento obtenido: {title}")
-        return True
+        out.append(f"✅ Documento obtenido: {title}")
+        _emit('document_fetched', title=title)
+        return content
     except Exception as e:
-        print(f"❌ Error al obtener contenido: {e}")
-        return False
+        out.append(f"❌ Error al obtener contenido: {e}")
+        _emit('error', stage='fetch_content', message=str(e))
+        return None
+    finally:
+        _flush(out)
+
+
+def _disk_cached_movies(reader: MovieDocReader, fetch):
+    """
+    Devuelve la lista de películas usando la caché en disco si el
+    revisionId del documento no cambió desde el último run.
+    """
+    meta = reader.service.documents().get(
+        documentId=reader.document_id,
+        fields='revisionId'
+    ).execute()
+    revision = meta.get('revisionId', 'sin-revision')
+
+    cache_file = CACHE_DIR / f'movies_{revision}.pkl'
+    if cache_file.exists():
+        _emit('cache_hit', revision=revision)
+        if not _NDJSON:
+            print(f"   (caché en disco: revisión {revision})")
+        return pickle.loads(cache_file.read_bytes())
+
+    movies = fetch()
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cache_file.write_bytes(pickle.dumps(movies))
+    return movies
+
+
+def _summarize_movies(movies):
+    """
+    Cuenta pendientes/vistas y junta los proponentes en una sola
+    pasada sobre la lista, sin materializar listas intermedias.
+    """
+    # dict en lugar de set: únicos con orden de aparición preservado
+    pending = seen = 0
+    proponents = {}
+    for m in movies:
+        pending += m.is_pending
+        seen += m.seen
+        proponents[m.proponente] = None
+    return pending, seen, proponents.keys()
 
 
 def test_get_movies(reader: MovieDocReader):
     """Prueba la obtención de películas."""
-    print("\n" + "=" * 50)
-    print("TEST: Obtener lista de películas")
-    print("=" * 50)
-    
+    out = ["\n" + _header("Obtener lista de películas")]
+
     try:
         movies = reader.get_movies()
-        print(f"✅ Total de películas encontradas: {len(movies)}")
-        
-        pending = [m for m in movies if m.is_pending]
-        seen = [m for m in movies if m.seen]
-        
-        print(f"   📌 Pendientes: {len(pending)}")
-        print(f"   ✅ Vistas: {len(seen)}")
-        
-        return movies
+        out.append(f"✅ Total de películas encontradas: {len(movies)}")
+
+        pending, seen, proponents = _summarize_movies(movies)
+
+        out.append(f"   📌 Pendientes: {pending}")
+        out.append(f"   ✅ Vistas: {seen}")
+        _emit('movie_count', total=len(movies), pending=pending, seen=seen)
+
+        return movies, proponents
     except Exception as e:
-        print(f"❌ Error al obtener películas: {e}")
-        return []
+        out.append(f"❌ Error al obtener películas: {e}")
+        _emit('error', stage='get_movies', message=str(e))
+        return [], set()
+    finally:
+        _flush(out)
 
 
-def test_delimiter_detection(reader: MovieDocReader):
+def test_delimiter_detection(reader: MovieDocReader, document: dict):
     """Prueba la detección del delimitador de última página."""
-    print("\n" + "=" * 50)
-    print("TEST: Detección de delimitador")
-    print("=" * 50)
-    
+    # Salida acumulada en una lista y un único write al final
+    out = ["\n" + _header("Detección de delimitador")]
+
     try:
-        document = reader.fetch_content()
         content = document.get('body', {}).get('content', [])
-        
-        print(f"Total de elementos en el documento: {len(content)}")
-        
+
+        out.append(f"Total de elementos en el documento: {len(content)}")
+
         # Buscar el delimitador
         delimiter_index = reader._find_delimiter_index(content)
-        
+
         if delimiter_index:
-            print(f"✅ Delimitador encontrado en índice: {delimiter_index}")
-            print(f"   Elementos antes del delimitador: {delimiter_index}")
-            print(f"   Elementos ignorados: {len(content) - delimiter_index}")
-            
+            _emit('delimiter_found', index=delimiter_index,
+                  elements=len(content))
+            out.append(f"✅ Delimitador encontrado en índice: {delimiter_index}")
+            out.append(f"   Elementos antes del delimitador: {delimiter_index}")
+            out.append(f"   Elementos ignorados: {len(content) - delimiter_index}")
+
             # Mostrar qué hay en ese índice
             if delimiter_index < len(content):
                 elem = content[delimiter_index]
@@ -92,10 +177,11 @@ def test_delimiter_detection(reader: MovieDocReader):
                         if 'textRun' in e:
                             text = e['textRun'].get('content', '').strip()
                             if text:
-                                print(f"   Texto del delimitador: '{text}'")
+                                out.append(f"   Texto del delimitador: '{text}'")
         else:
-            print("⚠️ No se encontró ningún delimitador")
-            print("\nMostrando últimos 5 elementos del documento:")
+            _emit('delimiter_missing', elements=len(content))
+            out.append("⚠️ No se encontró ningún delimitador")
+            out.append("\nMostrando últimos 5 elementos del documento:")
             for i, elem in enumerate(content[-5:]):
                 idx = len(content) - 5 + i
                 if 'paragraph' in elem:
@@ -103,89 +189,122 @@ def test_delimiter_detection(reader: MovieDocReader):
                         if 'textRun' in e:
                             text = e['textRun'].get('content', '').strip()
                             if text:
-                                print(f"   [{idx}] '{text[:50]}...' " if len(text) > 50 else f"   [{idx}] '{text}'")
+                                # Truncar primero, un solo f-string después
+                                preview = text if len(text) <= 50 else text[:50] + '...'
+                                out.append(f"   [{idx}] '{preview}'")
                 elif 'sectionBreak' in elem:
-                    print(f"   [{idx}] <sectionBreak>")
-                    
+                    out.append(f"   [{idx}] <sectionBreak>")
+
     except Exception as e:
-        print(f"❌ Error: {e}")
+        out.append(f"❌ Error: {e}")
+        _emit('error', stage='delimiter_detection', message=str(e))
+
+    _flush(out)
 
 
 def test_display_movies(movies, limit=10):
     """Muestra algunas películas de ejemplo."""
-    print("\n" + "=" * 50)
-    print(f"TEST: Mostrar primeras {limit} películas")
-    print("=" * 50)
-    
+    # Acumular las líneas y escribirlas de una sola vez: un write en
+    # lugar de ~3 prints (y syscalls) por película
+    out = ["\n" + _header(f"Mostrar primeras {limit} películas")]
+
     if not movies:
-        print("⚠️ No hay películas para mostrar")
-        return
-    
-    for i, movie in enumerate(movies[:limit], 1):
-        status = "✅" if movie.seen else "⏳"
-        print(f"{i}. {status} {movie.titulo}")
-        print(f"      Proponente: {movie.proponente}")
-        if movie.start_index:
-            print(f"      Índices: [{movie.start_index}, {movie.end_index}]")
+        out.append("⚠️ No hay películas para mostrar")
+    else:
+        for i, movie in enumerate(movies[:limit], 1):
+            status = "✅" if movie.seen else "⏳"
+            out.append(f"{i}. {status} {movie.titulo}")
+            out.append(f"      Proponente: {movie.proponente}")
+            if movie.start_index:
+                out.append(f"      Índices: [{movie.start_index}, {movie.end_index}]")
 
+    _flush(out)
 
-def test_filter_by_proponent(reader: MovieDocReader, proponent: str = None):
+
+def test_filter_by_proponent(movies, proponents, proponent: str = None):
     """Prueba el filtrado por proponente."""
-    print("\n" + "=" * 50)
-    print("TEST: Filtrar por proponente")
-    print("=" * 50)
-    
+    out = ["\n" + _header("Filtrar por proponente")]
+
     try:
-        movies = reader.get_movies()
-        
         if not movies:
-            print("⚠️ No hay películas")
+            out.append("⚠️ No hay películas")
             return
-        
-        # Obtener lista de proponentes únicos
-        proponents = set(m.proponente for m in movies)
-        print(f"Proponentes encontrados: {', '.join(proponents)}")
-        
+
+        # Proponentes únicos ya calculados en la pasada de test_get_movies
+        out.append(f"Proponentes encontrados: {', '.join(proponents)}")
+        _emit('proponents', names=list(proponents))
+
         if proponent:
-            filtered = reader.get_movies_by_proponent(proponent)
-            print(f"\nPelículas de '{proponent}': {len(filtered)}")
-            for m in filtered[:5]:
-                print(f"  - {m.titulo}")
-                
+            # Filtrar sobre la lista ya obtenida, sin otra pasada del lector
+            proponent_lower = proponent.lower()
+            filtered = [
+                m for m in movies if proponent_lower in m.proponente_lower
+            ]
+            out.append(f"\nPelículas de '{proponent}': {len(filtered)}")
+            out.extend(f"  - {m.titulo}" for m in filtered[:5])
+
     except Exception as e:
-        print(f"❌ Error: {e}")
+        out.append(f"❌ Error: {e}")
+        _emit('error', stage='filter_by_proponent', message=str(e))
+    finally:
+        _flush(out)
 
 
 def main():
     """Ejecuta todos los tests."""
-    print("\n🎬 TESTS DEL LECTOR DE GOOGLE DOCS 🎬\n")
+    if not _NDJSON:
+        print("\n🎬 TESTS DEL LECTOR DE GOOGLE DOCS 🎬\n")
+    _emit('run_start')
     
     # Test 1: Conexión
     reader = test_connection()
     if not reader:
-        print("\n❌ No se puede continuar sin conexión")
+        if not _NDJSON:
+            print("\n❌ No se puede continuar sin conexión")
         return
-    
-    # Test 2: Obtener contenido
-    if not test_fetch_content(reader):
-        print("\n❌ No se puede continuar sin contenido")
+
+    # Memoizar fetch_content en esta instancia: todo el run usa la misma
+    # descarga, incluso las llamadas internas de get_movies
+    reader.fetch_content = functools.cache(reader.fetch_content)
+
+    # Con --cache, reusar la lista parseada del run anterior si el
+    # documento no cambió (comparando revisionId)
+    if '--cache' in sys.argv:
+        original_get_movies = reader.get_movies
+        reader.get_movies = lambda: _disk_cached_movies(
+            reader, original_get_movies
+        )
+
+    # Test 2: Obtener contenido (una sola descarga para todos los tests)
+    document = test_fetch_content(reader)
+    if document is None:
+        if not _NDJSON:
+            print("\n❌ No se puede continuar sin contenido")
         return
+
+    # Tests 3 y 4 son independientes entre sí (ambos trabajan sobre la
+    # descarga ya cacheada): correrlos en paralelo. Cada test escribe su
+    # salida de un solo write, así no se entremezclan líneas
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        delimiter_future = executor.submit(
+            test_delimiter_detection, reader, document
+        )
+        movies_future = executor.submit(test_get_movies, reader)
+        movies, proponents = movies_future.result()
+        delimiter_future.result()
+
+    # Tests 5 y 6 solo leen la lista ya parseada: también en paralelo
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        display_future = executor.submit(test_display_movies, movies)
+        filter_future = executor.submit(
+            test_filter_by_proponent, movies, proponents
+        )
+        display_future.result()
+        filter_future.result()
     
-    # Test 3: Detección de delimitador
-    test_delimiter_detection(reader)
-    
-    # Test 4: Obtener películas
-    movies = test_get_movies(reader)
-    
-    # Test 5: Mostrar películas
-    test_display_movies(movies)
-    
-    # Test 6: Filtrar por proponente
-    test_filter_by_proponent(reader)
-    
-    print("\n" + "=" * 50)
-    print("✅ TESTS COMPLETADOS")
-    print("=" * 50)
+    _emit('done')
+    if not _NDJSON:
+        print(f"\n{_HDR}\n✅ TESTS COMPLETADOS\n{_HDR}")
 
 
 if __name__ == "__main__":